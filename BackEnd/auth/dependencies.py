@@ -1,9 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session  
+from sqlalchemy import select
 
 import models, database
+from auth.principal import UserPrincipal, cache_principal, get_cached_principal
 from auth.tokens import verify_access_token
 
 # OAuth2PasswordBearer expects the full login URL relative to the API root.
@@ -11,15 +12,36 @@ from auth.tokens import verify_access_token
 # ensure FastAPI generates the correct OpenAPI docs and token retrieval works.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/user/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
-    credentials_exception = HTTPException(
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    user_id = verify_access_token(token, credentials_exception)
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserPrincipal:
+    """Resolve the token to the user, from the principal cache when possible."""
+    credentials_exception = _credentials_exception()
+    user_id = int(verify_access_token(token, credentials_exception))
+
+    principal = await get_cached_principal(user_id)
+    if principal is not None:
+        return principal
+
+    # Cache miss: open a session only now, so cached requests never check out a connection
+    async with database.AsyncSessionLocal() as db:
+        result = await db.execute(select(models.User).where(models.User.id == user_id))
+        user = result.scalars().first()
     if user is None:
         raise credentials_exception
-    return user
+
+    principal = UserPrincipal.from_user(user)
+    await cache_principal(principal)
+    return principal
+
+
+async def get_current_user_id(current_user: UserPrincipal = Depends(get_current_user)) -> int:
+    """For routes that only need the id of the authenticated user."""
+    return current_user.id
@@ -1,7 +1,38 @@
+"""
+Password hashing.
+
+bcrypt is deliberately slow, so hashing runs on a dedicated bounded thread pool
+instead of the event loop or FastAPI's shared threadpool. A login storm then
+queues on this pool without starving other routes. Once more than
+HASH_MAX_PENDING operations are waiting or running, new ones are rejected with
+HashingBusyError so callers can shed load instead of queueing forever.
+
+BCRYPT_ROUNDS sets the work factor. Hashes made with a different cost are
+upgraded transparently on the next successful login (see verify_password).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
 from passlib.context import CryptContext
 
-# Create a bcrypt context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", os.cpu_count() or 2))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", HASH_WORKERS * 8))
+
+# min == max == default, so any hash with another cost is reported by needs_update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
 
 class Hash:
     @staticmethod
@@ -11,3 +42,94 @@ class Hash:
     @staticmethod
     def verify(plain_password: str, hashed_password: str) -> bool:
         return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashingBusyError(Exception):
+    """Raised when too many hashing operations are already queued."""
+
+
+class _HashingMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.queue_seconds_total = 0.0
+        self.queue_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": HASH_WORKERS,
+                "max_pending": HASH_MAX_PENDING,
+                "bcrypt_rounds": BCRYPT_ROUNDS,
+                "pending": self.pending,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_queue_ms": round(self.queue_seconds_total / completed * 1000, 2),
+                "max_queue_ms": round(self.queue_seconds_max * 1000, 2),
+                "avg_hash_ms": round(self.hash_seconds_total / completed * 1000, 2),
+            }
+
+
+hashing_metrics = _HashingMetrics()
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+async def _run(func, *args):
+    metrics = hashing_metrics
+    with metrics._lock:
+        if metrics.pending >= HASH_MAX_PENDING:
+            metrics.rejected += 1
+            raise HashingBusyError("Too many password hashing requests in progress")
+        metrics.pending += 1
+    submitted = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        with metrics._lock:
+            metrics.running += 1
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with metrics._lock:
+                metrics.running -= 1
+                metrics.completed += 1
+                metrics.queue_seconds_total += started - submitted
+                metrics.queue_seconds_max = max(metrics.queue_seconds_max, started - submitted)
+                metrics.hash_seconds_total += finished - started
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, timed)
+    finally:
+        with metrics._lock:
+            metrics.pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run(pwd_context.hash, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password against its stored hash.
+
+    Returns (valid, new_hash). new_hash is set when the password is valid but
+    the stored hash uses an outdated scheme or cost; the caller should store it.
+    """
+    valid, new_hash = await _run(pwd_context.verify_and_update, password, hashed_password)
+    if new_hash:
+        with hashing_metrics._lock:
+            hashing_metrics.rehashed += 1
+    return valid, new_hash
+
+
+def get_hashing_metrics() -> Dict[str, float]:
+    return hashing_metrics.snapshot()
@@ -0,0 +1,124 @@
+"""
+Authenticated user principal and its cache.
+
+get_current_user used to load the User row on every authenticated request. The
+fields routes actually need are cached in two levels, keyed by user id:
+
+1. An in-process TTL LRU (AUTH_CACHE_LOCAL_TTL, default 30s) that answers most
+   requests without any I/O.
+2. Redis (AUTH_CACHE_REDIS_TTL, default 300s), shared by all API workers.
+
+Entries are dropped when a User row is updated or deleted (password reset,
+account removal) via session hooks. Other processes' local caches are not
+notified, so they can serve the old entry for up to AUTH_CACHE_LOCAL_TTL.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import models
+from services.cache import cache_get_json, cache_set_json
+from services.post_commit import delete_after_commit
+
+AUTH_CACHE_LOCAL_TTL = float(os.getenv("AUTH_CACHE_LOCAL_TTL", 30))
+AUTH_CACHE_LOCAL_SIZE = int(os.getenv("AUTH_CACHE_LOCAL_SIZE", 10000))
+AUTH_CACHE_REDIS_TTL = int(os.getenv("AUTH_CACHE_REDIS_TTL", 300))
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """The authenticated user as seen by routes. Not attached to any session."""
+    id: int
+    user_id: str  # email
+    name: str
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "UserPrincipal":
+        return cls(id=user.id, user_id=user.user_id, name=user.name)
+
+
+class _LocalCache:
+    """Thread-safe LRU with a per-entry expiry."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: int) -> Optional[UserPrincipal]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: int, value: UserPrincipal):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: int):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+_local_cache = _LocalCache(AUTH_CACHE_LOCAL_SIZE, AUTH_CACHE_LOCAL_TTL)
+
+
+def _redis_key(user_id: int) -> str:
+    return f"auth_principal:{user_id}"
+
+
+async def get_cached_principal(user_id: int) -> Optional[UserPrincipal]:
+    principal = _local_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    cached = await cache_get_json(_redis_key(user_id))
+    if cached is not None:
+        principal = UserPrincipal(**cached)
+        _local_cache.set(user_id, principal)
+    return principal
+
+
+async def cache_principal(principal: UserPrincipal):
+    _local_cache.set(principal.id, principal)
+    await cache_set_json(_redis_key(principal.id), asdict(principal), AUTH_CACHE_REDIS_TTL)
+
+
+# --- Invalidation hooks ---
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context):
+    changed = {obj.id for obj in session.dirty if isinstance(obj, models.User)}
+    changed.update(obj.id for obj in session.deleted if isinstance(obj, models.User))
+    if changed:
+        session.info.setdefault("principals_changed", set()).update(changed)
+        # One DEL for all of them, sent after commit without blocking the event loop
+        delete_after_commit(session, *[_redis_key(user_id) for user_id in changed])
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session):
+    for user_id in session.info.pop("principals_changed", ()):
+        _local_cache.delete(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session):
+    session.info.pop("principals_changed", None)
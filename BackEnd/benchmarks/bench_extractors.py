@@ -0,0 +1,165 @@
+"""
+Benchmark for resume text extractors.
+
+Runs every extractor registered in utils.text_extractors against a local
+corpus of sample resumes and reports per-extractor latency, peak Python memory
+and text yield. With --write-policy the results are turned into the runtime
+extractor policy: per file type, extractors that meet the quality threshold on
+at least --min-pass-rate of the files are ordered fastest first, the rest
+follow as fallbacks ordered by pass rate.
+
+Usage (from the BackEnd directory):
+    python -m benchmarks.bench_extractors --corpus DIR [--rounds N] [--write-policy]
+
+Memory is measured with tracemalloc, so allocations made inside C extensions
+(PyMuPDF in particular) are not included.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+from utils.text_extractors import (
+    EXTRACTORS,
+    EXTRACTOR_POLICY_PATH,
+    MIN_ALNUM_RATIO,
+    MIN_TEXT_CHARS,
+    meets_quality_threshold,
+    text_yield,
+)
+
+
+def load_corpus(directory: str) -> Dict[str, List[tuple]]:
+    """Group sample files by extension: {ext: [(name, bytes), ...]}."""
+    corpus: Dict[str, List[tuple]] = {}
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            extension = os.path.splitext(name)[1].lower()
+            if extension in EXTRACTORS:
+                with open(os.path.join(root, name), "rb") as f:
+                    corpus.setdefault(extension, []).append((name, f.read()))
+    return corpus
+
+
+def benchmark_extractor(extractor, files: List[tuple], rounds: int) -> Dict:
+    latencies, peaks, chars, words = [], [], [], []
+    passed = errors = 0
+
+    for name, content in files:
+        try:
+            # One traced run for memory and yield, then timed runs
+            tracemalloc.start()
+            text = extractor(content) or ""
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+            for _ in range(rounds):
+                start = time.perf_counter()
+                extractor(content)
+                latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            print(f"  error on {name}: {e}")
+            errors += 1
+            continue
+
+        metrics = text_yield(text)
+        chars.append(metrics["chars"])
+        words.append(metrics["words"])
+        if meets_quality_threshold(text):
+            passed += 1
+
+    def median(values):
+        return statistics.median(values) if values else None
+
+    def p95(values):
+        return sorted(values)[max(0, round(len(values) * 0.95) - 1)] if values else None
+
+    return {
+        "files": len(files),
+        "errors": errors,
+        "pass_rate": passed / len(files) if files else 0.0,
+        "median_latency_ms": median(latencies) * 1000 if latencies else None,
+        "p95_latency_ms": p95(latencies) * 1000 if latencies else None,
+        "median_peak_kb": median(peaks) / 1024 if peaks else None,
+        "median_chars": median(chars),
+        "median_words": median(words),
+    }
+
+
+def build_policy(results: Dict[str, Dict[str, Dict]], min_pass_rate: float) -> Dict[str, List[str]]:
+    order = {}
+    for extension, by_extractor in results.items():
+        qualified = [
+            name for name, r in by_extractor.items()
+            if r["pass_rate"] >= min_pass_rate and r["median_latency_ms"] is not None
+        ]
+        qualified.sort(key=lambda name: by_extractor[name]["median_latency_ms"])
+        fallbacks = sorted(
+            (name for name in by_extractor if name not in qualified),
+            key=lambda name: by_extractor[name]["pass_rate"],
+            reverse=True,
+        )
+        order[extension] = qualified + fallbacks
+    return order
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Directory of sample .pdf/.docx resumes")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed runs per file and extractor")
+    parser.add_argument("--min-pass-rate", type=float, default=0.95,
+                        help="Share of files an extractor must extract above the quality threshold")
+    parser.add_argument("--write-policy", action="store_true", help="Write the resulting extractor policy")
+    parser.add_argument("--policy-path", default=EXTRACTOR_POLICY_PATH)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        raise SystemExit("No supported resumes found in corpus")
+
+    print(f"Quality threshold: >= {MIN_TEXT_CHARS} visible chars and >= {MIN_ALNUM_RATIO:.0%} alphanumeric")
+    results: Dict[str, Dict[str, Dict]] = {}
+    for extension, files in corpus.items():
+        print(f"\n{extension} ({len(files)} files)")
+        print(f"  {'extractor':<12} {'pass':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'peak KB':>9} {'chars':>8} {'words':>7}")
+        results[extension] = {}
+        for name, extractor in EXTRACTORS[extension].items():
+            r = benchmark_extractor(extractor, files, args.rounds)
+            results[extension][name] = r
+
+            def fmt(value, spec):
+                return format(value, spec) if value is not None else "-"
+
+            print(
+                f"  {name:<12} {r['pass_rate']:>6.0%} {r['errors']:>4} "
+                f"{fmt(r['median_latency_ms'], '>9.1f')} {fmt(r['p95_latency_ms'], '>9.1f')} "
+                f"{fmt(r['median_peak_kb'], '>9.0f')} {fmt(r['median_chars'], '>8.0f')} {fmt(r['median_words'], '>7.0f')}"
+            )
+
+    order = build_policy(results, args.min_pass_rate)
+    print("\nPolicy (first choice first):")
+    for extension, names in order.items():
+        print(f"  {extension}: {' -> '.join(names)}")
+
+    if args.write_policy:
+        with open(args.policy_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "generated_at": datetime.utcnow().isoformat(),
+                "min_text_chars": MIN_TEXT_CHARS,
+                "min_alnum_ratio": MIN_ALNUM_RATIO,
+                "min_pass_rate": args.min_pass_rate,
+                "order": order,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nPolicy written to {args.policy_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Import-time profile of the API and worker entry points.
+
+Runs each entry point in a fresh interpreter with `python -X importtime` and
+reports the total import time, the slowest top-level packages and which of the
+heavy libraries (Gemini, PDF/DOCX parsers, Celery) were loaded. The API should
+start without any of them; workers import Gemini at worker_init, after this
+profile's imports, so it only shows up here if something imports it eagerly.
+
+Usage (from the BackEnd directory, with the app's dependencies installed):
+    python -m benchmarks.bench_import_time [--runs N] [--top N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ENTRY_POINTS = {
+    "api": ("api", "import main"),
+    "worker": ("worker", "import tasks.celery_app, tasks.job_search, tasks.maintenance"),
+    "beat": ("beat", "import tasks.celery_app"),
+}
+
+HEAVY_MODULES = ("google.generativeai", "grpc", "fitz", "pdfminer", "docx", "docx2txt", "celery")
+
+
+def profile(role: str, statement: str) -> dict:
+    env = {**os.environ, "DB_ROLE": role}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{proc.stderr[-2000:]}")
+
+    per_package = defaultdict(int)
+    loaded = set()
+    total_us = 0
+    # Lines look like "import time:  self_us | cumulative_us |   <2 spaces per nesting level>module"
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name[1:]
+        module = name.strip()
+        loaded.add(module)
+        per_package[module.split(".")[0]] += int(self_us)
+        if len(name) - len(name.lstrip()) == 2:
+            # Top-level import: its cumulative time includes everything it pulled in
+            total_us += int(cumulative_us)
+
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    return {"total_ms": total_us / 1000, "per_package": per_package, "heavy": heavy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Runs per entry point (median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to list")
+    args = parser.parse_args()
+
+    for label, (role, statement) in ENTRY_POINTS.items():
+        results = [profile(role, statement) for _ in range(args.runs)]
+        total = statistics.median(result["total_ms"] for result in results)
+        last = results[-1]
+        print(f"\n{label}: {statement}")
+        print(f"  import time: {total:.0f}ms (median of {args.runs})")
+        print(f"  heavy modules loaded: {', '.join(last['heavy']) or 'none'}")
+        slowest = sorted(last["per_package"].items(), key=lambda item: item[1], reverse=True)[: args.top]
+        for package, self_us in slowest:
+            print(f"    {package:<28} {self_us / 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
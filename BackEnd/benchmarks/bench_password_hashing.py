@@ -0,0 +1,81 @@
+"""
+Benchmark for password hashing throughput.
+
+Drives auth.hashing.verify_password (the login path) from many concurrent
+coroutines and reports logins per second, per hashing thread and the queue
+wait seen by callers. Run it for several bcrypt costs to pick BCRYPT_ROUNDS:
+latency per login roughly doubles with every extra round.
+
+Usage (from the BackEnd directory):
+    BCRYPT_ROUNDS=12 HASH_WORKERS=4 python -m benchmarks.bench_password_hashing [--logins N] [--concurrency N]
+
+HASH_WORKERS above the number of cores does not add throughput, since bcrypt
+is CPU bound.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from auth.hashing import (
+    BCRYPT_ROUNDS,
+    HASH_MAX_PENDING,
+    HASH_WORKERS,
+    HashingBusyError,
+    get_hashing_metrics,
+    pwd_context,
+    verify_password,
+)
+
+
+async def run(logins: int, concurrency: int, stored_hash: str) -> dict:
+    latencies, rejected = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        nonlocal rejected
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                valid, _ = await verify_password("correct horse battery staple", stored_hash)
+                assert valid
+            except HashingBusyError:
+                rejected += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(logins)])
+    return {"wall": time.perf_counter() - started, "latencies": latencies, "rejected": rejected}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent login attempts")
+    args = parser.parse_args()
+
+    stored_hash = pwd_context.hash("correct horse battery staple")
+    result = asyncio.run(run(args.logins, args.concurrency, stored_hash))
+
+    latencies = sorted(result["latencies"])
+    completed = len(latencies)
+    throughput = completed / result["wall"]
+    metrics = get_hashing_metrics()
+
+    print(f"bcrypt rounds={BCRYPT_ROUNDS} workers={HASH_WORKERS} max_pending={HASH_MAX_PENDING} cores={os.cpu_count()}")
+    print(f"{completed} logins in {result['wall']:.2f}s, {result['rejected']} rejected")
+    print(f"throughput: {throughput:.1f} logins/s, {throughput / min(HASH_WORKERS, os.cpu_count() or 1):.1f} per core")
+    if latencies:
+        print(
+            f"latency p50={statistics.median(latencies) * 1000:.0f}ms "
+            f"p95={latencies[max(0, round(completed * 0.95) - 1)] * 1000:.0f}ms "
+            f"max={latencies[-1] * 1000:.0f}ms"
+        )
+    print(f"hash time avg={metrics['avg_hash_ms']}ms, queue wait avg={metrics['avg_queue_ms']}ms max={metrics['max_queue_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
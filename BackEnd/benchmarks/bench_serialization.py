@@ -0,0 +1,111 @@
+"""
+Benchmark for serializing job match lists.
+
+Compares the default FastAPI path (validate the ORM objects into the
+response_model, jsonable data via Pydantic, stdlib json) with the fast path
+from utils.serialization (dict projection + orjson) on lists of JobMatchOut
+and JobMatchSummaryOut of several sizes. The ORM rows are stood in for by
+plain objects with realistic field sizes, so no database is needed.
+
+Usage (from the BackEnd directory):
+    python -m benchmarks.bench_serialization [--sizes 10,50,200,1000] [--repeat N]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+
+import schemas
+from utils.serialization import projector
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to design, build and operate APIs in Python. "
+    "You will work with PostgreSQL, Redis and Celery, own services end to end and mentor others. "
+) * 30
+
+
+def make_matches(count: int) -> list:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    matches = []
+    for i in range(count):
+        job = SimpleNamespace(
+            id=i + 1,
+            job_id=f"job-{i:06d}",
+            employer_name="Acme Corporation",
+            job_title="Senior Backend Engineer",
+            job_description=DESCRIPTION,
+            job_description_preview=DESCRIPTION[:300],
+            job_apply_link=f"https://jobs.example.com/apply/{i}",
+            job_city="Bengaluru",
+            job_country="IN",
+            job_employment_type="FULLTIME",
+            employer_logo="https://cdn.example.com/logo.png",
+            job_is_remote=bool(i % 2),
+            job_posted_at_datetime_utc="2026-01-01T00:00:00.000Z",
+            job_required_skills=["python", "fastapi", "postgresql", "redis", "docker"],
+            job_min_salary=1200000.0,
+            job_max_salary=2400000.0,
+            job_salary_currency="INR",
+            job_salary_period="YEAR",
+            job_api_response={"job_id": f"job-{i:06d}", "job_highlights": {"Qualifications": ["5+ years"] * 5}},
+        )
+        matches.append(SimpleNamespace(
+            id=i + 1,
+            user_id=1,
+            job_id=job.id,
+            relevance_score=0.5 + (i % 50) / 100,
+            status="pending",
+            created_at=now - timedelta(minutes=i),
+            job=job,
+        ))
+    return matches
+
+
+def pydantic_path(adapter: TypeAdapter, matches: list) -> bytes:
+    validated = adapter.validate_python(matches, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+
+def fast_path(project, matches: list) -> bytes:
+    return orjson.dumps([project(match) for match in matches], option=orjson.OPT_NON_STR_KEYS)
+
+
+def time_it(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,50,200,1000", help="Comma separated list sizes")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for schema in (schemas.JobMatchOut, schemas.JobMatchSummaryOut):
+        adapter = TypeAdapter(List[schema])
+        project = projector(schema)
+        print(f"\n{schema.__name__}")
+        print(f"{'items':>6} {'pydantic+json':>15} {'projection+orjson':>18} {'speedup':>8} {'bytes':>9}")
+        for size in (int(s) for s in args.sizes.split(",")):
+            matches = make_matches(size)
+            # Both paths must produce the same document
+            assert json.loads(pydantic_path(adapter, matches)) == json.loads(fast_path(project, matches))
+            slow = time_it(lambda: pydantic_path(adapter, matches), args.repeat)
+            fast = time_it(lambda: fast_path(project, matches), args.repeat)
+            size_bytes = len(fast_path(project, matches))
+            print(f"{size:>6} {slow * 1000:>13.2f}ms {fast * 1000:>16.2f}ms {slow / fast:>7.1f}x {size_bytes:>9}")
+
+
+if __name__ == "__main__":
+    main()
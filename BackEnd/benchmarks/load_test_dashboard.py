@@ -0,0 +1,104 @@
+"""
+Load test for the dashboard endpoints.
+
+Fires concurrent authenticated requests at a running backend and reports the
+latency distribution per endpoint. Run it once against a build that uses the
+synchronous Session and once against the async one to compare tail latency
+under concurrent dashboard traffic.
+
+Usage (from the BackEnd directory):
+    python -m benchmarks.load_test_dashboard --token JWT [--base-url URL]
+        [--concurrency N] [--requests N] [--endpoint PATH ...]
+
+Get a token with POST /user/login. Requests are spread round-robin over the
+endpoints, which default to what the dashboard page loads.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import requests
+
+DEFAULT_ENDPOINTS = [
+    "/jobs/dashboard",
+    "/jobs/matches?limit=20",
+    "/jobs/applications?limit=20",
+    "/profile/",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, round(len(ordered) * pct / 100) - 1)]
+
+
+def run_load_test(base_url: str, token: str, endpoints: List[str], concurrency: int, total: int) -> Dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies: Dict[str, List[float]] = {endpoint: [] for endpoint in endpoints}
+    errors: Dict[str, int] = {endpoint: 0 for endpoint in endpoints}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def session() -> requests.Session:
+        # One connection pool per worker thread
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            local.session.headers.update(headers)
+        return local.session
+
+    def hit(i: int):
+        endpoint = endpoints[i % len(endpoints)]
+        start = time.perf_counter()
+        try:
+            response = session().get(f"{base_url}{endpoint}", timeout=60)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies[endpoint].append(elapsed)
+            if not ok:
+                errors[endpoint] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(hit, range(total)))
+    wall = time.perf_counter() - started
+
+    return {"wall_seconds": wall, "latencies": latencies, "errors": errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="Bearer token of a test user")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent client threads")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests to send")
+    parser.add_argument("--endpoint", action="append", dest="endpoints", help="Endpoint path (repeatable)")
+    args = parser.parse_args()
+
+    endpoints = args.endpoints or DEFAULT_ENDPOINTS
+    result = run_load_test(args.base_url.rstrip("/"), args.token, endpoints, args.concurrency, args.requests)
+
+    all_latencies = [value for values in result["latencies"].values() for value in values]
+    print(f"{args.requests} requests, concurrency {args.concurrency}, "
+          f"{args.requests / result['wall_seconds']:.1f} req/s over {result['wall_seconds']:.1f}s")
+    print(f"{'endpoint':<32} {'n':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    rows = list(result["latencies"].items()) + [("all", all_latencies)]
+    for endpoint, values in rows:
+        if not values:
+            continue
+        errors = sum(result["errors"].values()) if endpoint == "all" else result["errors"][endpoint]
+        print(
+            f"{endpoint:<32} {len(values):>6} {errors:>5} "
+            f"{statistics.median(values) * 1000:>9.1f} {percentile(values, 95) * 1000:>9.1f} "
+            f"{percentile(values, 99) * 1000:>9.1f} {max(values) * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
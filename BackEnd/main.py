@@ -1,23 +1,47 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends
 from sqlalchemy.orm import Session
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
-import tasks.job_search as job_search_tasks
+from tasks.dispatch import SCHEDULE_DAILY_JOB_SEARCHES, send_task
 from database import get_db
 
 from routers import user, profile, jobs, contact
-from database import Base, engine
+from database import get_pool_metrics
+from auth.hashing import get_hashing_metrics
+from utils.compression import CompressionMiddleware
+from services.read_routing import get_read_routing_metrics
+from redis_client import get_redis_metrics
+from utils.gemini import get_genai
 
 load_dotenv()
 
-# create the database table based on models.py if they don't exist
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic (migrations/); run `alembic upgrade head` before starting the app
+
+async def _warm_gemini():
+    try:
+        await asyncio.to_thread(get_genai)
+    except Exception as e:
+        print(f"Gemini SDK warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Import the Gemini SDK in a thread once the app is up, so neither startup
+    # nor the first resume request waits for it on the event loop
+    warm_up = asyncio.create_task(_warm_gemini())
+    yield
+    warm_up.cancel()
+
 
 app = FastAPI(
     title="Job Boost API",
     description="Backend API for Job Boost application",
-    version="1.2.1"
+    version="1.2.1",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -26,8 +50,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Added after CORS so it wraps it: compresses the final response, CORS headers included
+app.add_middleware(CompressionMiddleware)
+
 app.include_router(user.router)
 app.include_router(profile.router)
 app.include_router(jobs.router)
@@ -43,6 +71,17 @@ def root():
     }
 
 
+@app.get("/metrics")
+def metrics():
+    # Connection pool, read routing and password hashing pool state for this process
+    return {
+        "db_pool": get_pool_metrics(),
+        "redis": get_redis_metrics(),
+        "read_routing": get_read_routing_metrics(),
+        "password_hashing": get_hashing_metrics(),
+    }
+
+
 # @app.get("/health")
 # async def health_check():
 #     return {"status": "healthy", "service": "job-boost-api"}
@@ -57,8 +96,8 @@ def trigger_search(db: Session = Depends(get_db)):
     
     print("API endpoint called, triggering Celery task...")
     
-    # Use .delay() to send the task to the Celery queue
-    task = job_search_tasks.schedule_daily_job_searches.delay()
+    # Send the task to the Celery queue by name; the API never imports the task modules
+    task = send_task(SCHEDULE_DAILY_JOB_SEARCHES)
     
     return {
         "message": "Daily job search task has been triggered.",
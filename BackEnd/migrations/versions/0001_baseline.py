@@ -0,0 +1,136 @@
+"""Baseline schema
+
+Tables as they were created by Base.metadata.create_all before migrations were
+introduced. Each table is only created if it is missing, so databases that were
+set up by create_all can be upgraded in place.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_if_missing(name, *columns, indexes=(), **kwargs):
+    if sa.inspect(op.get_bind()).has_table(name):
+        return
+    op.create_table(name, *columns, **kwargs)
+    for index_name, index_columns, unique in indexes:
+        op.create_index(index_name, name, index_columns, unique=unique)
+
+
+def upgrade():
+    _create_if_missing(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.String(255), nullable=False),
+        sa.Column("password", sa.String(255), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        indexes=[("ix_users_id", ["id"], False), ("ix_users_user_id", ["user_id"], True)],
+    )
+
+    _create_if_missing(
+        "user_profile",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True),
+        sa.Column("query", sa.String(255)),
+        sa.Column("location", sa.String(255)),
+        sa.Column("mode_of_job", sa.String(50)),
+        sa.Column("work_experience", sa.String(100)),
+        sa.Column("employment_types", sa.JSON()),
+        sa.Column("company_types", sa.JSON()),
+        sa.Column("job_requirements", sa.Text()),
+        sa.Column("resume_location", sa.String(500)),
+        sa.Column("resume_text", sa.Text()),
+        sa.Column("resume_parsed", sa.JSON()),
+        sa.Column("resume_remarks", sa.JSON()),
+        sa.Column("last_updated", sa.DateTime()),
+        sa.Column("last_job_searched", sa.DateTime()),
+        sa.Column("preferences_set", sa.Boolean()),
+        indexes=[("ix_user_profile_id", ["id"], False)],
+    )
+
+    _create_if_missing(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("external_id", sa.String(255)),
+        sa.Column("job_id", sa.String(255), nullable=False),
+        sa.Column("employer_name", sa.String(255)),
+        sa.Column("job_title", sa.String(255)),
+        sa.Column("job_description", sa.Text(), nullable=False),
+        sa.Column("job_apply_link", sa.String(1024)),
+        sa.Column("job_city", sa.String(255)),
+        sa.Column("job_country", sa.String(5)),
+        sa.Column("job_employment_type", sa.String(255)),
+        sa.Column("employer_logo", sa.String(1024)),
+        sa.Column("job_is_remote", sa.Boolean()),
+        sa.Column("job_posted_at_datetime_utc", sa.String(255)),
+        sa.Column("job_required_skills", sa.JSON()),
+        sa.Column("job_min_salary", sa.Float()),
+        sa.Column("job_max_salary", sa.Float()),
+        sa.Column("job_salary_currency", sa.String(10)),
+        sa.Column("job_salary_period", sa.String(50)),
+        sa.Column("job_api_response", sa.JSON()),
+        indexes=[
+            ("ix_jobs_id", ["id"], False),
+            ("ix_jobs_external_id", ["external_id"], True),
+            ("ix_jobs_job_id", ["job_id"], True),
+            ("ix_jobs_employer_name", ["employer_name"], False),
+            ("ix_jobs_job_title", ["job_title"], False),
+        ],
+    )
+
+    _create_if_missing(
+        "job_matches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("relevance_score", sa.Float(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "applied", "not_interested", name="jobmatchstatus"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime()),
+        sa.UniqueConstraint("user_id", "job_id", name="unique_user_job_match"),
+        indexes=[("ix_job_matches_id", ["id"], False)],
+    )
+
+    _create_if_missing(
+        "user_match_stats",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total_matches", sa.Integer(), nullable=False),
+        sa.Column("high_relevance_jobs", sa.Integer(), nullable=False),
+        sa.Column("applied_jobs", sa.Integer(), nullable=False),
+        sa.Column("not_interested_jobs", sa.Integer(), nullable=False),
+        sa.Column("recent_buckets", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+    _create_if_missing(
+        "contacts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("subject", sa.String(500), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("contact_type", sa.String(50), nullable=False),
+        sa.Column("status", sa.Enum("pending", "resolved", name="contactstatus"), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("resolved_at", sa.DateTime()),
+        indexes=[("ix_contacts_id", ["id"], False), ("ix_contacts_email", ["email"], False)],
+    )
+
+
+def downgrade():
+    for table in ("contacts", "user_match_stats", "job_matches", "jobs", "user_profile", "users"):
+        op.drop_table(table)
+    sa.Enum(name="contactstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="jobmatchstatus").drop(op.get_bind(), checkfirst=True)
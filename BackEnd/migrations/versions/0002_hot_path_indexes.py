@@ -0,0 +1,46 @@
+"""Indexes for the job_matches and contacts hot paths
+
+Built with CREATE INDEX CONCURRENTLY so they can be applied to a live database
+without blocking writes. CONCURRENTLY cannot run inside a transaction, hence
+the autocommit block. If a concurrent build fails it leaves an INVALID index
+behind; drop it and re-run the upgrade.
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0002_hot_path_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+# name -> (table, column list)
+INDEXES = {
+    # /jobs/matches listing (keyset order), per-user counts and the stats reconcile
+    "ix_job_matches_user_score_created": ("job_matches", "user_id, relevance_score DESC, created_at DESC, id DESC"),
+    # /jobs/applications and status filtered counts
+    "ix_job_matches_user_status_created": ("job_matches", "user_id, status, created_at DESC, id DESC"),
+    # Recent matches per user
+    "ix_job_matches_user_created": ("job_matches", "user_id, created_at DESC"),
+    # Joins and cascades from jobs
+    "ix_job_matches_job_id": ("job_matches", "job_id"),
+    # /contact/messages, optionally filtered by status, newest first
+    "ix_contacts_status_created": ("contacts", "status, created_at DESC"),
+    "ix_contacts_created": ("contacts", "created_at DESC"),
+    # /contact/stats counts by type
+    "ix_contacts_contact_type": ("contacts", "contact_type"),
+}
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, (table, columns) in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,67 @@
+"""Full-text search vector on jobs
+
+Adds jobs.search_vector (title weighted A, employer B, description C), a
+trigger that fills it whenever those columns are written, and a GIN index for
+/jobs/search.
+
+The column is added nullable so no table rewrite is needed, existing rows are
+backfilled in committed batches, and the index is built CONCURRENTLY, so the
+upgrade can run against a live database.
+
+Revision ID: 0003_job_search_vector
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0003_job_search_vector"
+down_revision = "0002_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _vector(row: str) -> str:
+    return (
+        f"setweight(to_tsvector('english', coalesce({row}.job_title, '')), 'A') || "
+        f"setweight(to_tsvector('english', coalesce({row}.employer_name, '')), 'B') || "
+        f"setweight(to_tsvector('english', coalesce({row}.job_description, '')), 'C')"
+    )
+
+
+def upgrade():
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {_vector("NEW")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS jobs_search_vector_trigger ON jobs")
+    op.execute("""
+        CREATE TRIGGER jobs_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF job_title, employer_name, job_description ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+    """)
+
+    with op.get_context().autocommit_block():
+        # Each batch commits on its own, so row locks are short-lived
+        while True:
+            result = op.get_bind().exec_driver_sql(f"""
+                UPDATE jobs SET search_vector = {_vector("jobs")}
+                WHERE id IN (SELECT id FROM jobs WHERE search_vector IS NULL LIMIT {BACKFILL_BATCH_SIZE})
+            """)
+            if result.rowcount < BACKFILL_BATCH_SIZE:
+                break
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_search_vector ON jobs USING gin (search_vector)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_jobs_search_vector")
+    op.execute("DROP TRIGGER IF EXISTS jobs_search_vector_trigger ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS jobs_search_vector_update()")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,38 @@
+"""Covering indexes for match filters and facets
+
+/jobs/matches filters and /jobs/matches/facets join a user's matches to their
+jobs and only read a handful of narrow columns. These covering indexes let
+Postgres answer both sides with index-only scans instead of visiting the wide
+jobs rows. Built CONCURRENTLY, like 0002.
+
+Revision ID: 0004_match_facet_indexes
+Revises: 0003_job_search_vector
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0004_match_facet_indexes"
+down_revision = "0003_job_search_vector"
+branch_labels = None
+depends_on = None
+
+# name -> (table, index definition)
+INDEXES = {
+    "ix_job_matches_user_facets": ("job_matches", "(user_id, job_id) INCLUDE (status, relevance_score)"),
+    "ix_jobs_facets": (
+        "jobs",
+        "(id) INCLUDE (job_is_remote, job_employment_type, job_country, job_city, job_min_salary, job_max_salary)",
+    ),
+}
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, (table, definition) in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
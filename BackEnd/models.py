@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Boolean, Float, Enum, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Boolean, Float, Enum, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship, query_expression
 from datetime import datetime
 import enum
 
@@ -94,10 +95,27 @@ class Job(Base):
 
     # Store the full, raw API response for future use or debugging
     job_api_response = Column(JSON, nullable=True)
+
+    # Truncated job_description, only populated by queries that ask for it with with_expression()
+    job_description_preview = query_expression()
+
+    # Weighted title/employer/description lexemes for /jobs/search, maintained by a
+    # database trigger (migration 0003); never loaded into Python
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     
     # created a one-to-many relationship with JobMatch
     matches = relationship("JobMatch", back_populates="job", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('ix_jobs_search_vector', 'search_vector', postgresql_using='gin'),
+        # Index-only reads of the facet and filter columns when joining from job_matches
+        Index(
+            'ix_jobs_facets', 'id',
+            postgresql_include=['job_is_remote', 'job_employment_type', 'job_country', 'job_city',
+                                'job_min_salary', 'job_max_salary'],
+        ),
+    )
+
 
 class JobMatch(Base):
     __tablename__ = "job_matches"
@@ -112,6 +130,13 @@ class JobMatch(Base):
     # Prevent duplicate job matches for same user-job combination
     __table_args__ = (
         UniqueConstraint('user_id', 'job_id', name='unique_user_job_match'),
+        # Keyset pagination of /jobs/matches and /jobs/applications
+        Index('ix_job_matches_user_score_created', user_id, relevance_score.desc(), created_at.desc(), id.desc()),
+        Index('ix_job_matches_user_status_created', user_id, status, created_at.desc(), id.desc()),
+        Index('ix_job_matches_user_created', user_id, created_at.desc()),
+        Index('ix_job_matches_job_id', job_id),
+        # /jobs/matches/facets: the user's matches with their filter columns, index-only
+        Index('ix_job_matches_user_facets', user_id, job_id, postgresql_include=['status', 'relevance_score']),
     )
     
     # Relationships to easily access User and Job objects
@@ -119,6 +144,20 @@ class JobMatch(Base):
     job = relationship("Job", back_populates="matches")
 
 
+class UserMatchStats(Base):
+    __tablename__ = "user_match_stats"
+
+    # Dashboard counters per user, kept in step with job_matches by the session
+    # hooks in services/match_stats_service.py
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_matches = Column(Integer, nullable=False, default=0)
+    high_relevance_jobs = Column(Integer, nullable=False, default=0)
+    applied_jobs = Column(Integer, nullable=False, default=0)
+    not_interested_jobs = Column(Integer, nullable=False, default=0)
+    recent_buckets = Column(JSON, nullable=False, default=dict)  # {"YYYY-MM-DDTHH": count} for the last 24h
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class Contact(Base):
     __tablename__ = "contacts"
 
@@ -130,4 +169,19 @@ class Contact(Base):
     contact_type = Column(String(50), nullable=False)  # feedback, query, support
     status = Column(Enum(ContactStatus), default=ContactStatus.pending, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    resolved_at = Column(DateTime, nullable=True)
\ No newline at end of file
+    resolved_at = Column(DateTime, nullable=True)
+
+    # Admin listing and stats; created by migration 0002_hot_path_indexes
+    __table_args__ = (
+        Index('ix_contacts_status_created', status, created_at.desc()),
+        Index('ix_contacts_created', created_at.desc()),
+        Index('ix_contacts_contact_type', contact_type),
+    )
+
+
+# Session hooks that keep derived state (match stats, data versions, cached
+# principals) in step with these tables. Imported here, after every model is
+# defined, so any process that writes through the models has them registered.
+import services.match_stats_service  # noqa: E402,F401
+import services.data_version  # noqa: E402,F401
+import auth.principal  # noqa: E402,F401
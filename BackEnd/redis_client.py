@@ -1,7 +1,269 @@
+"""
+Redis Client Factory
+
+Every Redis user goes through this module. The server comes from REDIS_URL
+(or REDIS_HOST/REDIS_PORT) and each subsystem gets a named logical database:
+
+- cache:          cached lookups, auth principals, stats, data versions, rate limits
+- otp:            one-time passwords, kept apart so flushing the cache keeps them
+- celery_broker:  Celery task queue
+- celery_results: Celery task results
+
+get_redis(name) and get_async_redis(name) return one client per name and
+process, so all callers share its connection pool. Pools are created on first
+use; the sync pools reset themselves in a forked child (Celery workers) and
+never hand it the parent's sockets. Idle connections are PINGed before reuse
+after REDIS_HEALTH_CHECK_INTERVAL seconds, and a command that hits a dropped
+connection is retried on a fresh one (REDIS_RETRIES times).
+
+Celery connects through kombu with its own connections, so only its URLs come
+from here (redis_url), unless CELERY_BROKER_URL / CELERY_RESULT_BACKEND point it
+at another server. get_redis_metrics reports pool occupancy and round-trip
+latency per database for /metrics.
+"""
+
 import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 import redis
+import redis.asyncio as aioredis
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from redis.retry import Retry
 
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+# Any database number in the URL is replaced by the one of each subsystem
+REDIS_URL = os.getenv("REDIS_URL") or f"redis://{REDIS_HOST}:{REDIS_PORT}"
+
+REDIS_DATABASES: Dict[str, int] = {
+    "cache": int(os.getenv("REDIS_CACHE_DB", 0)),
+    "otp": int(os.getenv("REDIS_OTP_DB", 2)),
+    "celery_broker": int(os.getenv("REDIS_CELERY_BROKER_DB", 3)),
+    "celery_results": int(os.getenv("REDIS_CELERY_RESULTS_DB", 1)),
+}
+
+# Short timeouts: callers treat Redis as optional and fall back to the database
+# (or, for OTPs, to the in-memory store)
+REDIS_SOCKET_TIMEOUTS: Dict[str, float] = {
+    "cache": float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5)),
+    "otp": float(os.getenv("OTP_REDIS_TIMEOUT", 1.0)),
+}
+
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+REDIS_RETRIES = int(os.getenv("REDIS_RETRIES", 1))
+# Per pool and process; unset keeps redis-py's default
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 0)) or None
+
+
+def redis_url(name: str) -> str:
+    """URL of the named logical database."""
+    db = REDIS_DATABASES[name]
+    parts = urlsplit(REDIS_URL)
+    if parts.scheme == "unix":
+        # The path is the socket, the database goes in the query
+        query = urlencode({**dict(parse_qsl(parts.query)), "db": db})
+        return urlunsplit(parts._replace(query=query))
+    return urlunsplit(parts._replace(path=f"/{db}"))
+
+
+# --- Metrics ---
+
+class RedisStats:
+    """Round trips, connection errors and response latency for one pool. Thread safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.commands = 0
+            self.errors = 0
+            self.latency_seconds_total = 0.0
+            self.latency_seconds_max = 0.0
+
+    def record(self, elapsed: float):
+        with self._lock:
+            self.commands += 1
+            self.latency_seconds_total += elapsed
+            self.latency_seconds_max = max(self.latency_seconds_max, elapsed)
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "commands": self.commands,
+                "errors": self.errors,
+                "latency_seconds_avg": round(self.latency_seconds_total / self.commands, 6) if self.commands else 0.0,
+                "latency_seconds_max": round(self.latency_seconds_max, 6),
+            }
+
+
+_CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError)
+
+
+def _record_error(stats: RedisStats, error: Exception):
+    # A failed reconnect inside a send surfaces from both connect and send
+    if not getattr(error, "_redis_stats_recorded", False):
+        error._redis_stats_recorded = True
+        stats.record_error()
+
+
+class _InstrumentedConnectionMixin:
+    """
+    Times each round trip from the end of a send to its reply. A pipeline or
+    script counts once. Redis error replies count as round trips; connection
+    failures and timeouts count as errors.
+    """
+
+    stats: Optional[RedisStats] = None
+    _sent_at: Optional[float] = None
+
+    def connect(self, *args, **kwargs):
+        try:
+            return super().connect(*args, **kwargs)
+        except _CONNECTION_ERRORS as e:
+            _record_error(self.stats, e)
+            raise
+
+    def send_packed_command(self, *args, **kwargs):
+        try:
+            super().send_packed_command(*args, **kwargs)
+        except _CONNECTION_ERRORS as e:
+            _record_error(self.stats, e)
+            raise
+        self._sent_at = time.perf_counter()
+
+    def read_response(self, *args, **kwargs):
+        sent_at, self._sent_at = self._sent_at, None
+        try:
+            return super().read_response(*args, **kwargs)
+        except _CONNECTION_ERRORS as e:
+            _record_error(self.stats, e)
+            sent_at = None
+            raise
+        finally:
+            if sent_at is not None:
+                self.stats.record(time.perf_counter() - sent_at)
+
+
+class _AsyncInstrumentedConnectionMixin:
+    """Async counterpart of _InstrumentedConnectionMixin."""
+
+    stats: Optional[RedisStats] = None
+    _sent_at: Optional[float] = None
+
+    async def connect(self, *args, **kwargs):
+        try:
+            return await super().connect(*args, **kwargs)
+        except _CONNECTION_ERRORS as e:
+            _record_error(self.stats, e)
+            raise
+
+    async def send_packed_command(self, *args, **kwargs):
+        try:
+            await super().send_packed_command(*args, **kwargs)
+        except _CONNECTION_ERRORS as e:
+            _record_error(self.stats, e)
+            raise
+        self._sent_at = time.perf_counter()
+
+    async def read_response(self, *args, **kwargs):
+        sent_at, self._sent_at = self._sent_at, None
+        try:
+            return await super().read_response(*args, **kwargs)
+        except _CONNECTION_ERRORS as e:
+            _record_error(self.stats, e)
+            sent_at = None
+            raise
+        finally:
+            if sent_at is not None:
+                self.stats.record(time.perf_counter() - sent_at)
+
+
+def _instrument(pool, mixin, stats: RedisStats):
+    # from_url picks the connection class for the scheme (TCP, TLS, unix socket);
+    # wrap whichever it chose before the pool makes its first connection
+    base = pool.connection_class
+    pool.connection_class = type(base.__name__, (mixin, base), {"stats": stats})
+    return pool
+
+
+# --- Factory ---
+
+_clients: Dict[tuple, object] = {}
+_stats: Dict[tuple, RedisStats] = {}
+_clients_lock = threading.Lock()
+
+
+def _pool_kwargs(name: str, retry_class) -> dict:
+    timeout = REDIS_SOCKET_TIMEOUTS.get(name, REDIS_SOCKET_TIMEOUTS["cache"])
+    return {
+        "decode_responses": True,
+        "socket_timeout": timeout,
+        "socket_connect_timeout": timeout,
+        "health_check_interval": REDIS_HEALTH_CHECK_INTERVAL,
+        "retry": retry_class(ExponentialBackoff(cap=0.5, base=0.05), REDIS_RETRIES),
+        "retry_on_error": [RedisConnectionError, RedisTimeoutError],
+        "max_connections": REDIS_MAX_CONNECTIONS,
+    }
+
+
+def _get_client(name: str, kind: str):
+    key = (name, kind)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        if key not in _clients:
+            stats = _stats[key] = RedisStats()
+            if kind == "sync":
+                pool = redis.ConnectionPool.from_url(redis_url(name), **_pool_kwargs(name, Retry))
+                _clients[key] = redis.Redis(connection_pool=_instrument(pool, _InstrumentedConnectionMixin, stats))
+            else:
+                pool = aioredis.ConnectionPool.from_url(redis_url(name), **_pool_kwargs(name, AsyncRetry))
+                _clients[key] = aioredis.Redis(
+                    connection_pool=_instrument(pool, _AsyncInstrumentedConnectionMixin, stats)
+                )
+        return _clients[key]
+
+
+def get_redis(name: str = "cache") -> redis.Redis:
+    """Shared sync client for the named database (Celery tasks, scripts, session hooks)."""
+    return _get_client(name, "sync")
+
+
+def get_async_redis(name: str = "cache") -> aioredis.Redis:
+    """Shared async client for the named database, for use inside FastAPI routes."""
+    return _get_client(name, "async")
+
+
+def _describe_pool(pool) -> Dict[str, object]:
+    return {
+        "max_connections": pool.max_connections,
+        "created": getattr(pool, "_created_connections", None),
+        "in_use": len(getattr(pool, "_in_use_connections", ())),
+        "idle": len(getattr(pool, "_available_connections", ())),
+    }
+
+
+def get_redis_metrics() -> Dict[str, object]:
+    """Pool occupancy and latency of every client this process has created."""
+    metrics: Dict[str, object] = {}
+    for (name, kind), client in list(_clients.items()):
+        entry = metrics.setdefault(name, {"db": REDIS_DATABASES[name]})
+        entry[kind] = {**_describe_pool(client.connection_pool), **_stats[(name, kind)].snapshot()}
+    return metrics
+
 
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0, decode_responses=True)
+# Cache database clients, imported directly by most callers
+redis_client = get_redis("cache")
+async_redis_client = get_async_redis("cache")
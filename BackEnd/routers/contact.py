@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 import models, schemas
-from database import get_db
+from database import get_async_db
 from services.email_service import EmailService
+from services.contact_stats_service import fetch_contact_stats, invalidate_contact_stats
 
 router = APIRouter(prefix="/contact", tags=["Contact"])
 email_service = EmailService()
@@ -13,7 +16,7 @@ email_service = EmailService()
 @router.post("/submit", response_model=schemas.ContactOut)
 async def submit_contact_form(
     contact_data: schemas.ContactCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Submit a contact form message."""
     try:
@@ -35,11 +38,13 @@ async def submit_contact_form(
         )
         
         db.add(db_contact)
-        db.commit()
-        db.refresh(db_contact)
+        await db.commit()
+        await db.refresh(db_contact)
+        await invalidate_contact_stats()
 
-        # Send confirmation email to user
-        email_sent = email_service.send_contact_confirmation(
+        # Send confirmation email to user (blocking HTTP call, keep it off the event loop)
+        email_sent = await run_in_threadpool(
+            email_service.send_contact_confirmation,
             to_email=contact_data.email,
             name=contact_data.name,
             subject=contact_data.subject,
@@ -53,7 +58,7 @@ async def submit_contact_form(
         return db_contact
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         if isinstance(e, HTTPException):
             raise e
         print(f"Error submitting contact form: {e}")
@@ -65,28 +70,29 @@ async def get_all_contact_messages(
     limit: int = 50,
     offset: int = 0,
     status: str = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get all contact messages (admin endpoint)."""
-    query = db.query(models.Contact)
+    query = select(models.Contact)
     
     if status:
         if status.lower() in ["pending", "resolved"]:
-            query = query.filter(models.Contact.status == status.lower())
+            query = query.where(models.Contact.status == status.lower())
         else:
             raise HTTPException(status_code=400, detail="Invalid status. Must be 'pending' or 'resolved'")
     
-    contacts = query.order_by(models.Contact.created_at.desc()).offset(offset).limit(limit).all()
-    return contacts
+    result = await db.execute(query.order_by(models.Contact.created_at.desc()).offset(offset).limit(limit))
+    return result.scalars().all()
 
 
 @router.put("/messages/{contact_id}/resolve")
 async def resolve_contact_message(
     contact_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Mark a contact message as resolved (admin endpoint)."""
-    contact = db.query(models.Contact).filter(models.Contact.id == contact_id).first()
+    result = await db.execute(select(models.Contact).where(models.Contact.id == contact_id))
+    contact = result.scalars().first()
     
     if not contact:
         raise HTTPException(status_code=404, detail="Contact message not found")
@@ -98,41 +104,14 @@ async def resolve_contact_message(
     contact.status = models.ContactStatus.resolved
     contact.resolved_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(contact)
+    await db.commit()
+    await db.refresh(contact)
+    await invalidate_contact_stats()
     
     return {"message": "Contact message marked as resolved", "contact_id": contact_id}
 
 
 @router.get("/stats")
-async def get_contact_stats(db: Session = Depends(get_db)):
+async def get_contact_stats(db: AsyncSession = Depends(get_async_db)):
     """Get contact form statistics (admin endpoint)."""
-    total_contacts = db.query(models.Contact).count()
-    pending_contacts = db.query(models.Contact).filter(
-        models.Contact.status == models.ContactStatus.pending
-    ).count()
-    resolved_contacts = db.query(models.Contact).filter(
-        models.Contact.status == models.ContactStatus.resolved
-    ).count()
-    
-    # Count by contact type
-    feedback_count = db.query(models.Contact).filter(
-        models.Contact.contact_type == "feedback"
-    ).count()
-    query_count = db.query(models.Contact).filter(
-        models.Contact.contact_type == "query"
-    ).count()
-    support_count = db.query(models.Contact).filter(
-        models.Contact.contact_type == "support"
-    ).count()
-    
-    return {
-        "total_contacts": total_contacts,
-        "pending_contacts": pending_contacts,
-        "resolved_contacts": resolved_contacts,
-        "by_type": {
-            "feedback": feedback_count,
-            "query": query_count,
-            "support": support_count
-        }
-    }
+    return await fetch_contact_stats(db)
@@ -1,13 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload, load_only, with_expression
+from sqlalchemy import delete, desc, func, select, tuple_, update
 from typing import List, Optional
 from datetime import datetime, timedelta
 
 import models, schemas
-from database import get_db
-from auth.dependencies import get_current_user
-from tasks.job_search import find_and_match_jobs_for_user
+from database import get_async_db
+from services.read_routing import get_read_db
+from auth.dependencies import get_current_user_id
+from services.match_stats_service import get_match_stats, mark_match_stats_dirty
+from utils.pagination import NEXT_CURSOR_HEADER, InvalidCursorError, decode_cursor, encode_cursor, keyset_after
+from utils.serialization import fast_list_response
+from services.data_version import conditional_get, drop_etag, mark_data_changed
+from tasks.dispatch import FIND_AND_MATCH_JOBS_FOR_USER, send_task
+
+# Characters of job_description sent with list views
+JOB_PREVIEW_CHARS = 300
+
+# Job columns shown by the match and application lists
+JOB_SUMMARY_COLUMNS = (
+    models.Job.id,
+    models.Job.job_id,
+    models.Job.employer_name,
+    models.Job.job_title,
+    models.Job.job_apply_link,
+    models.Job.job_city,
+    models.Job.job_country,
+    models.Job.job_employment_type,
+    models.Job.employer_logo,
+    models.Job.job_is_remote,
+    models.Job.job_posted_at_datetime_utc,
+    models.Job.job_min_salary,
+    models.Job.job_max_salary,
+    models.Job.job_salary_currency,
+    models.Job.job_salary_period,
+)
+
+
+def job_summary_options():
+    """Load only the list columns of a job, plus a truncated description."""
+    return (
+        load_only(*JOB_SUMMARY_COLUMNS),
+        with_expression(
+            models.Job.job_description_preview,
+            func.left(models.Job.job_description, JOB_PREVIEW_CHARS),
+        ),
+    )
+
+
+def job_summary_loader():
+    """Eager-load the summary columns of a match's job."""
+    return joinedload(models.JobMatch.job).options(*job_summary_options())
+
+
+# Filterable and faceted dimensions of a match
+FACET_COLUMNS = {
+    "status": models.JobMatch.status,
+    "remote": models.Job.job_is_remote,
+    "employment_type": models.Job.job_employment_type,
+    "country": models.Job.job_country,
+    "city": models.Job.job_city,
+}
+# Facets with many distinct values only list the most common ones
+FACET_VALUE_LIMIT = 20
+
+# Largest batch accepted by the bulk match endpoints
+BULK_MAX_MATCHES = 500
+
+
+def _parse_match_status(value: str) -> models.JobMatchStatus:
+    normalized = value.strip().lower().replace("_", " ")
+    for status in models.JobMatchStatus:
+        if status.value == normalized:
+            return status
+    raise HTTPException(status_code=400, detail=f"Unknown status: {value}")
+
+
+def match_filters(
+    min_relevance: Optional[float] = None,
+    status: Optional[str] = None,
+    remote: Optional[bool] = None,
+    employment_type: Optional[str] = None,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    min_salary: Optional[float] = None,
+    max_salary: Optional[float] = None,
+) -> list:
+    """
+    WHERE clauses for the match filters; the query must join jobs.
+
+    The salary range keeps jobs whose advertised range overlaps it (in the
+    job's own currency and period); jobs without a salary are left out.
+    """
+    filters = []
+    if min_relevance is not None:
+        filters.append(models.JobMatch.relevance_score >= min_relevance)
+    if status:
+        filters.append(models.JobMatch.status == _parse_match_status(status))
+    if remote is not None:
+        filters.append(models.Job.job_is_remote == remote)
+    if employment_type:
+        filters.append(func.upper(models.Job.job_employment_type) == employment_type.upper())
+    if city:
+        filters.append(func.lower(models.Job.job_city) == city.lower())
+    if country:
+        filters.append(models.Job.job_country == country.upper())
+    if min_salary is not None:
+        filters.append(func.coalesce(models.Job.job_max_salary, models.Job.job_min_salary) >= min_salary)
+    if max_salary is not None:
+        filters.append(func.coalesce(models.Job.job_min_salary, models.Job.job_max_salary) <= max_salary)
+    return filters
+
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
@@ -20,9 +125,8 @@ async def test_endpoint():
 
 @router.get("/dashboard", response_model=schemas.DashboardResponse)
 async def get_dashboard_data(
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """
     Dashboard endpoint that checks if job search is needed and triggers it if required.
@@ -30,9 +134,10 @@ async def get_dashboard_data(
     """
     try:
         # Get user profile
-        user_profile = db.query(models.UserProfile).filter(
-            models.UserProfile.user_id == current_user.id
-        ).first()
+        result = await db.execute(
+            select(models.UserProfile).where(models.UserProfile.user_id == current_user_id)
+        )
+        user_profile = result.scalars().first()
         
         if not user_profile:
             return {
@@ -98,18 +203,18 @@ async def get_dashboard_data(
                 search_reason = "system_error"
         
         if needs_job_search:
-            print(f"Starting job search for user {current_user.id}, reason: {search_reason}")
+            print(f"Starting job search for user {current_user_id}, reason: {search_reason}")
             print(f"Current time: {current_time}")
             print(f"Previous last_job_searched: {user_profile.last_job_searched}")
             
             # Update last_job_searched timestamp
             user_profile.last_job_searched = current_time
-            db.commit()
+            await db.commit()
             
             print(f"Updated last_job_searched to: {user_profile.last_job_searched}")
             
-            # Trigger background job search
-            background_tasks.add_task(find_and_match_jobs_for_user, current_user.id)
+            # Trigger background job search on the Celery workers
+            await run_in_threadpool(send_task, FIND_AND_MATCH_JOBS_FOR_USER, current_user_id)
             
             return {
                 "status": "searching",
@@ -121,7 +226,7 @@ async def get_dashboard_data(
             }
         else:
             # Get dashboard stats
-            dashboard_stats = await get_job_match_stats_internal(db, current_user)
+            dashboard_stats = await get_job_match_stats_internal(db, current_user_id)
             
             return {
                 "status": "ready",
@@ -139,40 +244,10 @@ async def get_dashboard_data(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-async def get_job_match_stats_internal(db: Session, current_user: models.User) -> dict:
+async def get_job_match_stats_internal(db: AsyncSession, current_user_id: int) -> dict:
     """Internal function to get dashboard stats without auth dependency."""
     try:
-        # Total job matches
-        total_matches = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id
-        ).count()
-        
-        # High relevance jobs (>= 70%)
-        high_relevance_jobs = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id,
-            models.JobMatch.relevance_score >= 0.7
-        ).count()
-        
-        # Jobs added in the last 24 hours
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        
-        recent_matches = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id,
-            models.JobMatch.created_at >= yesterday
-        ).count()
-        
-        # Applied jobs count
-        applied_jobs = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id,
-            models.JobMatch.status == models.JobMatchStatus.applied
-        ).count()
-        
-        return {
-            "total_matches": total_matches,
-            "high_relevance_jobs": high_relevance_jobs,
-            "recent_matches": recent_matches,
-            "applied_jobs": applied_jobs
-        }
+        return await get_match_stats(db, current_user_id)
         
     except Exception as e:
         print(f"Error in get_job_match_stats_internal: {e}")
@@ -184,82 +259,77 @@ async def get_job_match_stats_internal(db: Session, current_user: models.User) -
         }
 
 
-@router.get("/matches", response_model=List[schemas.JobMatchOut])
+@router.get(
+    "/matches",
+    response_model=List[schemas.JobMatchSummaryOut],
+    dependencies=[Depends(conditional_get("jobs:matches"))],
+)
 async def get_job_matches(
+    response: Response,
     limit: Optional[int] = 50,
     offset: Optional[int] = 0,
-    min_relevance: Optional[float] = None,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    filters: list = Depends(match_filters),
+    db: AsyncSession = Depends(get_read_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
-    """Get job matches for the current user."""
+    """
+    Get job matches for the current user.
+
+    Jobs are summarised (description preview, no raw API response); fetch
+    /jobs/matches/{match_id} for the full job. Pass the X-Next-Cursor response header back as `cursor` to fetch the next
+    page; `offset` is still accepted for older clients but gets slower with depth.
+    Filters (status, remote, employment_type, city, country, salary range,
+    min_relevance) are applied in the database; /jobs/matches/facets counts them.
+    """
     
     try:
-        query = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id
-        ).options(joinedload(models.JobMatch.job))  # Eager load job details
-        
-        # Filter by minimum relevance score if provided
-        if min_relevance is not None:
-            query = query.filter(models.JobMatch.relevance_score >= min_relevance)
-        
-        # Order by relevance score (highest first) and creation date
-        query = query.order_by(
-            desc(models.JobMatch.relevance_score),
-            desc(models.JobMatch.created_at)
-        )
+        # Join jobs once for both the filters and the eager load of the job's list columns
+        query = select(models.JobMatch).join(models.JobMatch.job).where(
+            models.JobMatch.user_id == current_user_id,
+            *filters,
+        ).options(contains_eager(models.JobMatch.job).options(*job_summary_options()))
+        
+        # Order by relevance score (highest first) and creation date, id breaks ties
+        sort_columns = (models.JobMatch.relevance_score, models.JobMatch.created_at, models.JobMatch.id)
+        query = query.order_by(*[desc(column) for column in sort_columns])
         
         # Apply pagination
-        job_matches = query.offset(offset).limit(limit).all()
+        if cursor:
+            after = decode_cursor(cursor, ("score", "created_at", "id"), datetime_keys=("created_at",))
+            query = query.where(keyset_after(sort_columns, (after["score"], after["created_at"], after["id"])))
+        else:
+            query = query.offset(offset)
+        result = await db.execute(query.limit(limit))
+        job_matches = result.scalars().all()
+        
+        if limit and len(job_matches) == limit:
+            last = job_matches[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                {"score": last.relevance_score, "created_at": last.created_at, "id": last.id}
+            )
         
-        return job_matches
+        # Skip response_model re-validation; the rows already have the summary shape
+        return fast_list_response(schemas.JobMatchSummaryOut, job_matches, response)
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error in get_job_matches: {e}")
+        drop_etag(response)
         # Return empty list if there's an error
         return []
 
 
 @router.get("/matches/stats", response_model=schemas.DashboardStats)
 async def get_job_match_stats(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Get job match statistics for the current user."""
     
     try:
-        # Total job matches
-        total_matches = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id
-        ).count()
-        
-        # High relevance jobs (>= 70%)
-        high_relevance_jobs = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id,
-            models.JobMatch.relevance_score >= 0.7
-        ).count()
-        
-        # Jobs added in the last 24 hours
-        from datetime import datetime, timedelta
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        
-        recent_matches = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id,
-            models.JobMatch.created_at >= yesterday
-        ).count()
-        
-        # Applied jobs count
-        applied_jobs = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id,
-            models.JobMatch.status == models.JobMatchStatus.applied
-        ).count()
-        
-        return {
-            "total_matches": total_matches,
-            "high_relevance_jobs": high_relevance_jobs,
-            "recent_matches": recent_matches,
-            "applied_jobs": applied_jobs
-        }
+        return await get_match_stats(db, current_user_id)
         
     except Exception as e:
         # Return zeros if there's any error
@@ -272,18 +342,120 @@ async def get_job_match_stats(
         }
 
 
+# Registered before /matches/{match_id} so "facets" is not taken for an id
+@router.get(
+    "/matches/facets",
+    response_model=schemas.JobMatchFacets,
+    dependencies=[Depends(conditional_get("jobs:matches:facets"))],
+)
+async def get_job_match_facets(
+    filters: list = Depends(match_filters),
+    db: AsyncSession = Depends(get_read_db),
+    current_user_id: int = Depends(get_current_user_id),
+):
+    """
+    Counts of the current user's matches per status, remote, employment type,
+    country and city, plus the salary bounds, under the given filters.
+
+    All facets come from one GROUPING SETS query: one set per facet column and
+    an empty set for the total.
+    """
+    groupings = {name: func.grouping(column).label(f"grouping_{name}") for name, column in FACET_COLUMNS.items()}
+    query = select(
+        *[column.label(name) for name, column in FACET_COLUMNS.items()],
+        *groupings.values(),
+        func.count().label("count"),
+        func.min(models.Job.job_min_salary).label("min_salary"),
+        func.max(models.Job.job_max_salary).label("max_salary"),
+    ).select_from(models.JobMatch).join(models.JobMatch.job).where(
+        models.JobMatch.user_id == current_user_id,
+        *filters,
+    ).group_by(
+        func.grouping_sets(*[tuple_(column) for column in FACET_COLUMNS.values()], tuple_())
+    )
+    result = await db.execute(query)
+
+    facets = {name: [] for name in FACET_COLUMNS}
+    summary = {"total": 0, "min_salary": None, "max_salary": None}
+    for row in result.all():
+        # grouping() is 0 for the column this row is grouped by
+        grouped_by = [name for name in FACET_COLUMNS if getattr(row, f"grouping_{name}") == 0]
+        if not grouped_by:
+            summary = {"total": row.count, "min_salary": row.min_salary, "max_salary": row.max_salary}
+            continue
+        name = grouped_by[0]
+        value = getattr(row, name)
+        if isinstance(value, models.JobMatchStatus):
+            value = value.value
+        facets[name].append({"value": value, "count": row.count})
+
+    for name, values in facets.items():
+        values.sort(key=lambda facet: facet["count"], reverse=True)
+        del values[FACET_VALUE_LIMIT:]
+    return {**summary, **facets}
+
+
+# Registered before /matches/{match_id} so "high-relevance" is not taken for an id
+@router.get("/matches/high-relevance", response_model=schemas.HighRelevanceJobsResponse)
+async def get_high_relevance_jobs(
+    min_relevance: float = 0.7,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_read_db),
+    current_user_id: int = Depends(get_current_user_id),
+):
+    """Get job matches with high relevance scores."""
+    try:
+        result = await db.execute(
+            select(models.JobMatch).where(
+                models.JobMatch.user_id == current_user_id,
+                models.JobMatch.relevance_score >= min_relevance
+            ).options(joinedload(models.JobMatch.job))
+            .order_by(desc(models.JobMatch.relevance_score)).limit(limit)
+        )
+        high_relevance_jobs = result.scalars().all()
+        
+        return {
+            "message": f"Found {len(high_relevance_jobs)} high-relevance job matches",
+            "min_relevance": min_relevance,
+            "matches": [
+                {
+                    "id": match.id,
+                    # Job fields come from the eagerly loaded relationship; lazy
+                    # loads are not available on an AsyncSession
+                    "job_title": match.job.job_title,
+                    "company_name": match.job.employer_name,
+                    "relevance_score": match.relevance_score,
+                    "relevance_percentage": int(match.relevance_score * 100) if match.relevance_score else 0,
+                    "location": match.job.job_city,
+                    "created_at": match.created_at,
+                    "status": match.status.value
+                }
+                for match in high_relevance_jobs
+            ]
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching high-relevance jobs: {str(e)}"
+        )
+
+
 @router.get("/matches/{match_id}", response_model=schemas.JobMatchOut)
 async def get_job_match(
     match_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Get a specific job match by ID."""
     
-    job_match = db.query(models.JobMatch).filter(
-        models.JobMatch.id == match_id,
-        models.JobMatch.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(models.JobMatch).where(
+            models.JobMatch.id == match_id,
+            models.JobMatch.user_id == current_user_id
+        ).options(joinedload(models.JobMatch.job))
+    )
+    job_match = result.scalars().first()
     
     if not job_match:
         raise HTTPException(status_code=404, detail="Job match not found")
@@ -295,8 +467,8 @@ async def get_job_match(
 async def update_job_match_status(
     match_id: int,
     status: str,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Update the status of a job match."""
     
@@ -309,18 +481,21 @@ async def update_job_match_status(
         )
     
     # Find the job match
-    job_match = db.query(models.JobMatch).filter(
-        models.JobMatch.id == match_id,
-        models.JobMatch.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(models.JobMatch).where(
+            models.JobMatch.id == match_id,
+            models.JobMatch.user_id == current_user_id
+        )
+    )
+    job_match = result.scalars().first()
     
     if not job_match:
         raise HTTPException(status_code=404, detail="Job match not found")
     
-    # Update the status
-    job_match.status = status
-    db.commit()
-    db.refresh(job_match)
+    # Update the status; assign the enum so the stats hook sees the same type it compares against
+    job_match.status = models.JobMatchStatus[status]
+    await db.commit()
+    await db.refresh(job_match)
     
     return {
         "message": "Job match status updated successfully",
@@ -332,23 +507,26 @@ async def update_job_match_status(
 @router.delete("/matches/{match_id}")
 async def delete_job_match(
     match_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Delete a job match completely from the database."""
     
     # Find the job match
-    job_match = db.query(models.JobMatch).filter(
-        models.JobMatch.id == match_id,
-        models.JobMatch.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(models.JobMatch).where(
+            models.JobMatch.id == match_id,
+            models.JobMatch.user_id == current_user_id
+        )
+    )
+    job_match = result.scalars().first()
     
     if not job_match:
         raise HTTPException(status_code=404, detail="Job match not found")
     
     # Delete the job match
-    db.delete(job_match)
-    db.commit()
+    await db.delete(job_match)
+    await db.commit()
     
     return {
         "message": "Job match deleted successfully",
@@ -356,31 +534,192 @@ async def delete_job_match(
     }
 
 
-@router.get("/applications", response_model=List[schemas.JobMatchOut])
+def _bulk_match_ids(match_ids: List[int]) -> List[int]:
+    """Deduplicated ids in request order, within the batch limit."""
+    ids = list(dict.fromkeys(match_ids))
+    if not ids:
+        raise HTTPException(status_code=400, detail="No match ids given")
+    if len(ids) > BULK_MAX_MATCHES:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_MATCHES} matches per request")
+    return ids
+
+
+def _bulk_response(message: str, ids: List[int], done: set, outcome: str) -> dict:
+    results = [{"match_id": match_id, "outcome": outcome if match_id in done else "not_found"} for match_id in ids]
+    return {
+        "message": message,
+        "succeeded": len(done),
+        "not_found": len(ids) - len(done),
+        "results": results,
+    }
+
+
+@router.post("/matches/bulk-status", response_model=schemas.BulkMatchResponse)
+async def bulk_update_job_match_status(
+    request: schemas.BulkMatchStatusUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id),
+):
+    """
+    Set the status of many matches with one UPDATE.
+
+    Ids that do not exist or belong to another user are reported as not_found.
+    """
+    
+    valid_statuses = ["pending", "applied", "not_interested"]
+    if request.status not in valid_statuses:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+        )
+    ids = _bulk_match_ids(request.match_ids)
+    
+    result = await db.execute(
+        update(models.JobMatch)
+        .where(models.JobMatch.user_id == current_user_id, models.JobMatch.id.in_(ids))
+        .values(status=models.JobMatchStatus[request.status])
+        .returning(models.JobMatch.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = set(result.scalars().all())
+    
+    # Set-based statements bypass the ORM hooks: recompute stats and bump the
+    # data version once for the whole batch
+    if updated:
+        mark_match_stats_dirty(db, current_user_id)
+        mark_data_changed(db, current_user_id)
+    await db.commit()
+    
+    return _bulk_response("Job match statuses updated", ids, updated, "updated")
+
+
+@router.post("/matches/bulk-delete", response_model=schemas.BulkMatchResponse)
+async def bulk_delete_job_matches(
+    request: schemas.BulkMatchDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id),
+):
+    """Delete many matches with one DELETE. Unknown ids are reported as not_found."""
+    
+    ids = _bulk_match_ids(request.match_ids)
+    
+    result = await db.execute(
+        delete(models.JobMatch)
+        .where(models.JobMatch.user_id == current_user_id, models.JobMatch.id.in_(ids))
+        .returning(models.JobMatch.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = set(result.scalars().all())
+    
+    if deleted:
+        mark_match_stats_dirty(db, current_user_id)
+        mark_data_changed(db, current_user_id)
+    await db.commit()
+    
+    return _bulk_response("Job matches deleted", ids, deleted, "deleted")
+
+
+@router.get(
+    "/applications",
+    response_model=List[schemas.JobMatchSummaryOut],
+    dependencies=[Depends(conditional_get("jobs:applications"))],
+)
 async def get_applications(
+    response: Response,
     limit: Optional[int] = 50,
     offset: Optional[int] = 0,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
-    """Get all applied jobs (applications) for the current user."""
+    """Get all applied jobs (applications) for the current user. Paginates like /matches."""
     
     try:
-        query = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id,
+        query = select(models.JobMatch).where(
+            models.JobMatch.user_id == current_user_id,
             models.JobMatch.status == models.JobMatchStatus.applied
-        ).options(joinedload(models.JobMatch.job))  # Eager load job details
+        ).options(job_summary_loader())  # Eager load the job's list columns
         
-        # Order by creation date (most recent first)
-        query = query.order_by(desc(models.JobMatch.created_at))
+        # Order by creation date (most recent first), id breaks ties
+        sort_columns = (models.JobMatch.created_at, models.JobMatch.id)
+        query = query.order_by(*[desc(column) for column in sort_columns])
         
         # Apply pagination
-        applications = query.offset(offset).limit(limit).all()
+        if cursor:
+            after = decode_cursor(cursor, ("created_at", "id"), datetime_keys=("created_at",))
+            query = query.where(keyset_after(sort_columns, (after["created_at"], after["id"])))
+        else:
+            query = query.offset(offset)
+        result = await db.execute(query.limit(limit))
+        applications = result.scalars().all()
         
-        return applications
+        if limit and len(applications) == limit:
+            last = applications[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"created_at": last.created_at, "id": last.id})
         
+        return fast_list_response(schemas.JobMatchSummaryOut, applications, response)
+        
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error in get_applications: {e}")
+        drop_etag(response)
+        # Return empty list if there's an error
+        return []
+
+
+@router.get("/search", response_model=List[schemas.JobSummaryOut])
+async def search_jobs(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200),
+    remote: Optional[bool] = None,
+    employment_type: Optional[str] = None,
+    country: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user_id: int = Depends(get_current_user_id),
+):
+    """
+    Full-text search over every job fetched so far, best matches first.
+
+    `q` accepts web search syntax ("quoted phrases", -excluded, OR). Pass the
+    X-Next-Cursor response header back as `cursor` for the next page.
+    """
+    
+    try:
+        ts_query = func.websearch_to_tsquery("english", q)
+        rank = func.ts_rank_cd(models.Job.search_vector, ts_query)
+        query = select(models.Job, rank.label("rank")).where(
+            models.Job.search_vector.op("@@")(ts_query)
+        ).options(*job_summary_options())
+        
+        # Filters
+        if remote is not None:
+            query = query.where(models.Job.job_is_remote == remote)
+        if employment_type:
+            query = query.where(func.upper(models.Job.job_employment_type) == employment_type.upper())
+        if country:
+            query = query.where(models.Job.job_country == country.upper())
+        
+        # Order by rank (best first), id breaks ties
+        query = query.order_by(desc(rank), desc(models.Job.id))
+        if cursor:
+            after = decode_cursor(cursor, ("rank", "id"))
+            query = query.where(keyset_after((rank, models.Job.id), (after["rank"], after["id"])))
+        result = await db.execute(query.limit(limit))
+        rows = result.all()
+        
+        if len(rows) == limit:
+            last_job, last_rank = rows[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"rank": last_rank, "id": last_job.id})
+        
+        return fast_list_response(schemas.JobSummaryOut, [job for job, _ in rows], response)
+        
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error in search_jobs: {e}")
         # Return empty list if there's an error
         return []
 
@@ -389,16 +728,19 @@ async def get_applications(
 @router.post("/matches/{match_id}/calculate-relevance", response_model=schemas.RelevanceCalculationResponse)
 async def calculate_job_match_relevance(
     match_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Calculate relevance score for a new job match (only if not already calculated)."""
     try:
         # Verify the job match belongs to the current user
-        job_match = db.query(models.JobMatch).filter(
-            models.JobMatch.id == match_id,
-            models.JobMatch.user_id == current_user.id
-        ).first()
+        result = await db.execute(
+            select(models.JobMatch).where(
+                models.JobMatch.id == match_id,
+                models.JobMatch.user_id == current_user_id
+            )
+        )
+        job_match = result.scalars().first()
         
         if not job_match:
             raise HTTPException(
@@ -441,57 +783,21 @@ async def calculate_job_match_relevance(
         )
 
 
-@router.get("/matches/high-relevance", response_model=schemas.HighRelevanceJobsResponse)
-async def get_high_relevance_jobs(
-    min_relevance: float = 0.7,
-    limit: int = 20,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
-):
-    """Get job matches with high relevance scores."""
-    try:
-        high_relevance_jobs = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id,
-            models.JobMatch.relevance_score >= min_relevance
-        ).order_by(desc(models.JobMatch.relevance_score)).limit(limit).all()
-        
-        return {
-            "message": f"Found {len(high_relevance_jobs)} high-relevance job matches",
-            "min_relevance": min_relevance,
-            "matches": [
-                {
-                    "id": job.id,
-                    "job_title": job.job_title,
-                    "company_name": job.company_name,
-                    "relevance_score": job.relevance_score,
-                    "relevance_percentage": int(job.relevance_score * 100) if job.relevance_score else 0,
-                    "location": job.location,
-                    "created_at": job.created_at,
-                    "status": job.status
-                }
-                for job in high_relevance_jobs
-            ]
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching high-relevance jobs: {str(e)}"
-        )
-
-
 @router.post("/matches/fix-zero-scores")
 async def fix_zero_relevance_scores(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Fix job matches that have zero relevance scores."""
     try:
         # Find matches with zero or very low relevance scores
-        zero_score_matches = db.query(models.JobMatch).filter(
-            models.JobMatch.user_id == current_user.id,
-            models.JobMatch.relevance_score <= 0.05  # Essentially zero
-        ).options(joinedload(models.JobMatch.job)).all()
+        result = await db.execute(
+            select(models.JobMatch).where(
+                models.JobMatch.user_id == current_user_id,
+                models.JobMatch.relevance_score <= 0.05  # Essentially zero
+            ).options(joinedload(models.JobMatch.job))
+        )
+        zero_score_matches = result.scalars().all()
         
         if not zero_score_matches:
             return {
@@ -500,9 +806,10 @@ async def fix_zero_relevance_scores(
             }
         
         # Get user profile for relevance calculation
-        user_profile = db.query(models.UserProfile).filter(
-            models.UserProfile.user_id == current_user.id
-        ).first()
+        result = await db.execute(
+            select(models.UserProfile).where(models.UserProfile.user_id == current_user_id)
+        )
+        user_profile = result.scalars().first()
         
         if not user_profile or not user_profile.resume_parsed:
             raise HTTPException(
@@ -535,7 +842,7 @@ async def fix_zero_relevance_scores(
                     print(f"Error calculating relevance for job match {job_match.id}: {e}")
                     continue
         
-        db.commit()
+        await db.commit()
         
         return {
             "message": f"Successfully fixed {fixed_count} job matches with zero relevance scores",
@@ -546,7 +853,7 @@ async def fix_zero_relevance_scores(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Error fixing zero relevance scores: {str(e)}"
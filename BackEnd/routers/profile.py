@@ -1,45 +1,64 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import os
 from datetime import datetime
 
 import models, schemas
-from utils.resume_parser import extract_text_from_upload, parse_resume_with_analysis, validate_file_constraints
-from tasks.job_search import find_and_match_jobs_for_user
-from database import get_db
+from utils.resume_parser import extract_text_from_upload, parse_resume_structured, generate_resume_analysis, validate_file_constraints
+from tasks.dispatch import FIND_AND_MATCH_JOBS_FOR_USER, send_task
+from database import AsyncSessionLocal, get_async_db
+from services.read_routing import get_read_db
 from auth.dependencies import get_current_user
+from auth.principal import UserPrincipal
+from services.data_version import conditional_get
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
 
 
-def _get_or_create_profile(db: Session, user: models.User) -> models.UserProfile:
+async def _get_or_create_profile(db: AsyncSession, user: UserPrincipal) -> models.UserProfile:
 
     # Retrieves a user's profile from the database. If a profile does not exist, create a new one.
     
-    profile = (
-        db.query(models.UserProfile).filter(models.UserProfile.user_id == user.id).first()
+    result = await db.execute(
+        select(models.UserProfile).where(models.UserProfile.user_id == user.id)
     )
+    profile = result.scalars().first()
 
     if not profile:
         profile = models.UserProfile(user_id=user.id)
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
 
     return profile
 
 
+async def _read_profile(db: AsyncSession, user: UserPrincipal) -> models.UserProfile:
+    """Profile for read-only routes, whose session may be on the read replica."""
+    result = await db.execute(
+        select(models.UserProfile).where(models.UserProfile.user_id == user.id)
+    )
+    profile = result.scalars().first()
+    if profile is None:
+        # Creating it is a write, which must go to the primary
+        async with AsyncSessionLocal() as primary:
+            profile = await _get_or_create_profile(primary, user)
+    return profile
+
+
 @router.post("/job-preferences", response_model=schemas.UserProfileOut)
 async def create_job_preferences(
     preferences: schemas.JobPreferencesCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Create or update user job preferences."""
     
-    profile = _get_or_create_profile(db, current_user)
+    profile = await _get_or_create_profile(db, current_user)
 
     # Check if all required fields are provided
     required_fields = {
@@ -100,12 +119,12 @@ async def create_job_preferences(
     
     profile.last_updated = datetime.utcnow()
     
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
 
     # Only trigger job search if preferences are set and not cleared
     # if profile.preferences_set and profile.query and profile.query.strip():
-    #     find_and_match_jobs_for_user.delay(current_user.id)
+    #     send_task(FIND_AND_MATCH_JOBS_FOR_USER, current_user.id)
 
     # Create response with resume status
     profile_dict = {
@@ -133,8 +152,8 @@ async def create_job_preferences(
 @router.post("/upload-resume", response_model=schemas.ResumeUploadResponse)
 async def upload_resume(
     resume: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Upload and parse resume with enhanced validation."""
     
@@ -179,9 +198,9 @@ async def upload_resume(
                 detail="Unable to parse the resume. Make sure to upload a relevant document only."
             )
         
-        # Parse resume with AI and get analysis
-        print(f"Starting AI parsing and analysis for user {current_user.id}...")
-        result = await parse_resume_with_analysis(resume_text)
+        # Parse resume with AI (analysis is generated lazily on first request)
+        print(f"Starting AI parsing for user {current_user.id}...")
+        result = await parse_resume_structured(resume_text)
         print(f"AI parsing completed for user {current_user.id}")
         
         # Check if resume was deemed unfit
@@ -204,9 +223,8 @@ async def upload_resume(
                 detail=result.get("message", "Failed to parse resume")
             )
         
-        # Extract parsed data and analysis
+        # Extract parsed data
         parsed_data = result.get("parsed_data", {})
-        analysis = result.get("analysis", {})
         
     except HTTPException:
         # Re-raise HTTP exceptions (our custom validation errors)
@@ -222,22 +240,22 @@ async def upload_resume(
         )
     
     # Update or create user profile
-    profile = _get_or_create_profile(db, current_user)
+    profile = await _get_or_create_profile(db, current_user)
     
     profile.resume_location = file_path
     profile.resume_text = resume_text
     profile.resume_parsed = parsed_data
-    profile.resume_remarks = analysis
+    profile.resume_remarks = None  # Stale for the new resume, regenerated on next request
     profile.last_updated = datetime.utcnow()
     
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
     
     # Trigger job search if user has job preferences set
     if profile.query and profile.query.strip():
         try:
             print(f"Triggering job search for user {current_user.id} after resume upload...")
-            find_and_match_jobs_for_user.delay(current_user.id)
+            await run_in_threadpool(send_task, FIND_AND_MATCH_JOBS_FOR_USER, current_user.id)
         except Exception as e:
             print(f"Failed to trigger job search: {e}")
             # Don't fail resume upload if job search scheduling fails
@@ -255,13 +273,13 @@ async def upload_resume(
     )
 
 
-@router.get("/", response_model=schemas.UserProfileOut)
+@router.get("/", response_model=schemas.UserProfileOut, dependencies=[Depends(conditional_get("profile"))])
 async def get_profile(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Get user profile."""
-    profile = _get_or_create_profile(db, current_user)
+    profile = await _read_profile(db, current_user)
     
     # Create response with resume status
     profile_dict = {
@@ -288,13 +306,14 @@ async def get_profile(
 
 @router.get("/resume-status")
 async def get_resume_status(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Get resume upload status."""
-    profile = db.query(models.UserProfile).filter(
-        models.UserProfile.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(models.UserProfile).where(models.UserProfile.user_id == current_user.id)
+    )
+    profile = result.scalars().first()
     
     if not profile or not profile.resume_location:
         return {
@@ -315,13 +334,14 @@ async def get_resume_status(
 
 @router.delete("/resume")
 async def delete_resume(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Delete uploaded resume."""
-    profile = db.query(models.UserProfile).filter(
-        models.UserProfile.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(models.UserProfile).where(models.UserProfile.user_id == current_user.id)
+    )
+    profile = result.scalars().first()
     
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
@@ -338,20 +358,63 @@ async def delete_resume(
     profile.resume_location = None
     profile.resume_text = None
     profile.resume_parsed = None
+    profile.resume_remarks = None
     
-    db.commit()
+    await db.commit()
     
     return {"message": "Resume deleted successfully"}
 
 
-@router.get("/complete", response_model=schemas.CompleteUserProfile)
+@router.get("/resume-analysis", response_model=schemas.ResumeAnalysisResponse)
+async def get_resume_analysis(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Get the AI analysis of the uploaded resume, generating it on first request."""
+    result = await db.execute(
+        select(models.UserProfile).where(models.UserProfile.user_id == current_user.id)
+    )
+    profile = result.scalars().first()
+    
+    if not profile or not profile.resume_text:
+        raise HTTPException(status_code=404, detail="No resume uploaded")
+    
+    # Serve the cached analysis if it was already generated for this resume
+    if profile.resume_remarks:
+        return {"resume_remarks": profile.resume_remarks, "cached": True}
+    
+    resume_text = profile.resume_text
+    # End the read transaction so the Gemini call doesn't hold a pooled connection
+    await db.commit()
+    analysis = await generate_resume_analysis(resume_text)
+    if "error" in analysis:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Resume analysis is currently unavailable: {analysis['error']}"
+        )
+    
+    # Short write transaction; only cache it if the resume was not replaced
+    # while the analysis was running
+    await db.refresh(profile)
+    if profile.resume_text == resume_text:
+        profile.resume_remarks = analysis
+        await db.commit()
+    
+    return {"resume_remarks": analysis, "cached": False}
+
+
+@router.get(
+    "/complete",
+    response_model=schemas.CompleteUserProfile,
+    dependencies=[Depends(conditional_get("profile:complete"))],
+)
 async def get_complete_profile(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Get complete user profile including user details."""
     
-    profile = _get_or_create_profile(db, current_user)
+    profile = await _read_profile(db, current_user)
     
     # Create complete profile response
     complete_profile = {
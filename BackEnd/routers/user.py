@@ -1,21 +1,49 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 import random
 
 import models, schemas
-from database import get_db
-from auth.hashing import Hash
+from database import get_async_db
+from auth.hashing import HashingBusyError, hash_password, verify_password
 from auth.tokens import create_access_token
 from services.otp_service import OTPService
 from services.email_service import EmailService
+from services.rate_limit import rate_limit
 import os
 
 router = APIRouter(prefix="/user", tags=["User"])
 otp_service = OTPService()
 email_service = EmailService()
 
+# Checked before any hashing, OTP storage or email sending
+registration_limit = rate_limit("registration", per_ip="10/3600", per_user="3/900")
+password_reset_limit = rate_limit("password_reset", per_ip="10/3600", per_user="3/900")
+login_limit = rate_limit("login", per_ip="30/300", per_user="10/300", identity_field="username")
+
+
+async def _get_user_by_email(db: AsyncSession, email: str):
+    """
+    Look up a user and end the read transaction, so no pooled connection is held
+    while the route waits on bcrypt, Redis or email. The returned row stays
+    loaded; assigning to it and committing opens a new, short transaction.
+    """
+    result = await db.execute(select(models.User).where(models.User.user_id == email))
+    user = result.scalars().first()
+    await db.commit()
+    return user
+
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many requests, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
 # @router.post("/debug-reset-password")
 # async def debug_reset_password(request: Request):
 #     """Debug endpoint to see raw request"""
@@ -30,37 +58,41 @@ email_service = EmailService()
 #     return {"message": "debug complete"}
 
 
-@router.post("/request-registration")
-def request_registration(request: schemas.RegistrationRequest, db: Session = Depends(get_db)):
-    if db.query(models.User).filter(models.User.user_id == request.user_id).first():
+@router.post("/request-registration", dependencies=[Depends(registration_limit)])
+async def request_registration(request: schemas.RegistrationRequest, db: AsyncSession = Depends(get_async_db)):
+    if await _get_user_by_email(db, request.user_id):
         raise HTTPException(status_code=400, detail="user exists")
 
     otp = otp_service.generate_otp()
     
     # Store registration data with OTP
+    try:
+        hashed_password = await hash_password(request.password)
+    except HashingBusyError:
+        raise _hashing_busy()
     registration_data = {
         "name": request.name,
-        "password": Hash.bcrypt(request.password)
+        "password": hashed_password
     }
     
-    otp_service.store_otp(request.user_id, otp, "registration", ttl_minutes=5, 
-                         additional_data=registration_data)
+    await run_in_threadpool(otp_service.store_otp, request.user_id, otp, "registration", ttl_minutes=5,
+                            additional_data=registration_data)
     
     print("your otp for current session is", otp)
-    if not email_service.send_otp(request.user_id, otp):
-        otp_service.delete_otp(request.user_id, "registration")
+    if not await run_in_threadpool(email_service.send_otp, request.user_id, otp):
+        await run_in_threadpool(otp_service.delete_otp, request.user_id, "registration")
         raise HTTPException(status_code=400, detail="Invalid email id")
     return {"message": "OTP sent"}
 
 
 @router.post("/confirm-registration", response_model=schemas.UserResponse)
-def confirm_registration(request: schemas.RegistrationVerify, db: Session = Depends(get_db)):
+async def confirm_registration(request: schemas.RegistrationVerify, db: AsyncSession = Depends(get_async_db)):
     # Verify OTP and get stored data
-    stored_data = otp_service.verify_otp(request.user_id, request.otp, "registration")
+    stored_data = await run_in_threadpool(otp_service.verify_otp, request.user_id, request.otp, "registration")
     if not stored_data:
         raise HTTPException(status_code=400, detail="Invalid or expired OTP")
 
-    if db.query(models.User).filter(models.User.user_id == request.user_id).first():
+    if await _get_user_by_email(db, request.user_id):
         raise HTTPException(status_code=400, detail="User ID already registered")
 
     name = stored_data.get("name")
@@ -70,69 +102,81 @@ def confirm_registration(request: schemas.RegistrationVerify, db: Session = Depe
 
     new_user = models.User(user_id=request.user_id, name=name, password=password)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     profile = models.UserProfile(user_id=new_user.id)
     db.add(profile)
-    db.commit()
+    await db.commit()
     return new_user
 
 
-@router.post("/login")
-def login_user(request: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.user_id == request.username).first()
-    if not user or not Hash.verify(request.password, user.password):
+@router.post("/login", dependencies=[Depends(login_limit)])
+async def login_user(request: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await _get_user_by_email(db, request.username)
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    try:
+        valid, new_hash = await verify_password(request.password, user.password)
+    except HashingBusyError:
+        raise _hashing_busy()
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    if new_hash:
+        # Stored hash used an old cost or scheme, upgrade it now that we know the
+        # password; this is the only write and runs in its own short transaction
+        user.password = new_hash
+        await db.commit()
 
     access_token = create_access_token(data={"user_id": user.id})
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.post("/request-password-reset")
-def request_password_reset(request: schemas.PasswordResetRequest, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.user_id == request.user_id).first()
+@router.post("/request-password-reset", dependencies=[Depends(password_reset_limit)])
+async def request_password_reset(request: schemas.PasswordResetRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await _get_user_by_email(db, request.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     otp = otp_service.generate_otp()
-    otp_service.store_otp(request.user_id, otp, "password_reset", ttl_minutes=10)
+    await run_in_threadpool(otp_service.store_otp, request.user_id, otp, "password_reset", ttl_minutes=10)
     
     print("your otp to reset password is ", otp)
-    if not email_service.send_password_reset_otp(request.user_id, otp):
-        otp_service.delete_otp(request.user_id, "password_reset")
+    if not await run_in_threadpool(email_service.send_password_reset_otp, request.user_id, otp):
+        await run_in_threadpool(otp_service.delete_otp, request.user_id, "password_reset")
         raise HTTPException(status_code=400, detail="Unable to send OTP. Please check your email address.")
     
     return {"message": "OTP sent"}
 
 
 @router.post("/verify-otp")
-def verify_otp(request: schemas.RegistrationVerify, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.user_id == request.user_id).first()
+async def verify_otp(request: schemas.RegistrationVerify, db: AsyncSession = Depends(get_async_db)):
+    user = await _get_user_by_email(db, request.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not otp_service.is_otp_valid(request.user_id, request.otp, "password_reset"):
+    if not await run_in_threadpool(otp_service.is_otp_valid, request.user_id, request.otp, "password_reset"):
         raise HTTPException(status_code=400, detail="Invalid or expired OTP")
 
     return {"message": "OTP verified"}
 
 
 @router.post("/reset-password")
-def reset_password(request: schemas.PasswordUpdate, db: Session = Depends(get_db)):
+async def reset_password(request: schemas.PasswordUpdate, db: AsyncSession = Depends(get_async_db)):
     print(f"=== PASSWORD RESET DEBUG ===")
     print(f"Request user_id: {request.user_id}")
     print(f"Request OTP: {request.otp}")
     print(f"Request has password: {bool(request.password)}")
     
-    user = db.query(models.User).filter(models.User.user_id == request.user_id).first()
+    user = await _get_user_by_email(db, request.user_id)
     if not user:
         print(f"User not found: {request.user_id}")
         raise HTTPException(status_code=404, detail="User not found")
     print(f"User found: {user.user_id}")
 
     print(f"Verifying OTP for user: {request.user_id}")
-    stored_data = otp_service.verify_otp(request.user_id, request.otp, "password_reset")
+    stored_data = await run_in_threadpool(otp_service.verify_otp, request.user_id, request.otp, "password_reset")
     if stored_data is None:
         print(f"OTP verification failed for user: {request.user_id}")
         raise HTTPException(status_code=400, detail="Invalid or expired OTP")
@@ -140,8 +184,11 @@ def reset_password(request: schemas.PasswordUpdate, db: Session = Depends(get_db
     print(f"OTP verified successfully for user: {request.user_id}")
 
     print(f"Updating password for user: {request.user_id}")
-    user.password = Hash.bcrypt(request.password)
-    db.commit()
+    try:
+        user.password = await hash_password(request.password)
+    except HashingBusyError:
+        raise _hashing_busy()
+    await db.commit()
     
     print(f"Password reset completed successfully for user: {request.user_id}")
     return {"message": "Password updated successfully"}
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 
 
@@ -158,6 +158,11 @@ class ResumeUploadResponse(BaseModel):
     status: str
 
 
+class ResumeAnalysisResponse(BaseModel):
+    resume_remarks: Dict[str, Any]
+    cached: bool
+
+
 # ---------------- API Response Schemas ----------------
 class APIResponse(BaseModel):
     success: bool
@@ -199,6 +204,29 @@ class JobOut(JobBase):
         from_attributes = True
 
 
+class JobSummaryOut(BaseModel):
+    """List view of a job: no full description or raw API response."""
+    id: int
+    job_id: str
+    employer_name: Optional[str] = None
+    job_title: Optional[str] = None
+    job_description_preview: Optional[str] = None
+    job_apply_link: Optional[str] = None
+    job_city: Optional[str] = None
+    job_country: Optional[str] = None
+    job_employment_type: Optional[str] = None
+    employer_logo: Optional[str] = None
+    job_is_remote: Optional[bool] = False
+    job_posted_at_datetime_utc: Optional[str] = None
+    job_min_salary: Optional[float] = None
+    job_max_salary: Optional[float] = None
+    job_salary_currency: Optional[str] = None
+    job_salary_period: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 # ---------------- Job Match Schemas ----------------
 class JobMatchBase(BaseModel):
     user_id: int
@@ -218,6 +246,36 @@ class JobMatchOut(JobMatchBase):
         from_attributes = True
 
 
+class JobMatchSummaryOut(JobMatchBase):
+    id: int
+    created_at: datetime
+    job: JobSummaryOut  # Full details are served by /jobs/matches/{match_id}
+
+    class Config:
+        from_attributes = True
+
+
+class BulkMatchStatusUpdate(BaseModel):
+    match_ids: List[int]
+    status: str
+
+
+class BulkMatchDelete(BaseModel):
+    match_ids: List[int]
+
+
+class BulkMatchOutcome(BaseModel):
+    match_id: int
+    outcome: str  # "updated", "deleted" or "not_found"
+
+
+class BulkMatchResponse(BaseModel):
+    message: str
+    succeeded: int
+    not_found: int
+    results: List[BulkMatchOutcome]
+
+
 # ---------------- Contact Schemas ----------------
 class ContactBase(BaseModel):
     name: str
@@ -247,6 +305,24 @@ class DashboardStats(BaseModel):
     high_relevance_jobs: int 
     recent_matches: int
     applied_jobs: int
+    not_interested_jobs: int = 0
+
+
+class FacetValue(BaseModel):
+    value: Optional[Union[bool, str]] = None
+    count: int
+
+
+class JobMatchFacets(BaseModel):
+    """Match counts per filter value, under the filters currently applied."""
+    total: int
+    status: List[FacetValue]
+    remote: List[FacetValue]
+    employment_type: List[FacetValue]
+    country: List[FacetValue]
+    city: List[FacetValue]
+    min_salary: Optional[float] = None
+    max_salary: Optional[float] = None
 
 
 class DashboardResponse(BaseModel):
@@ -0,0 +1,344 @@
+"""
+Bulk Resume Ingestion
+
+Loads a directory or archive (.zip / .tar / .tar.gz) of PDF/DOCX resumes into
+UserProfile rows without going through /profile/upload-resume one file at a time.
+
+Usage (from the BackEnd directory):
+    python -m scripts.bulk_ingest_resumes <source> --mapping mapping.csv
+
+The mapping CSV needs a header with `filename` and `user_email` columns. A
+filename is either a path relative to the source (`team_a/cv.pdf`), matching
+that file only, or a bare name (`cv.pdf`), matching files with that name in any
+folder. Text extraction runs in a process pool, Gemini parsing runs with
+bounded concurrency and profiles are written in batches. Progress is stored in
+a checkpoint file, keyed by the path inside the source, so an interrupted run
+can be restarted and will skip files that are already done. Files without a
+mapping are not checkpointed and are picked up once the mapping lists them.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import posixpath
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+
+# Size the database pool for a script rather than the API
+os.environ.setdefault("DB_ROLE", "script")
+
+import models
+from database import SessionLocal
+from utils.resume_parser import extract_text_from_upload, parse_resume_structured, validate_file_constraints
+
+UPLOAD_DIR = "uploads"
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+
+# --- Input helpers ---
+
+def normalize_path(path: str) -> str:
+    """Relative path inside the source with forward slashes, e.g. 'team_a/cv.pdf'."""
+    path = posixpath.normpath(path.replace("\\", "/"))
+    while path.startswith("./"):
+        path = path[2:]
+    return path.lstrip("/")
+
+
+def load_user_mapping(mapping_path: str) -> Dict[str, str]:
+    """Read the filename -> user email mapping from a CSV file."""
+    mapping = {}
+    with open(mapping_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or "filename" not in reader.fieldnames or "user_email" not in reader.fieldnames:
+            raise ValueError("Mapping file must have 'filename' and 'user_email' columns")
+        for row in reader:
+            filename = (row.get("filename") or "").strip()
+            email = (row.get("user_email") or "").strip().lower()
+            if filename and email:
+                mapping[normalize_path(filename)] = email
+    return mapping
+
+
+def mapped_email(mapping: Dict[str, str], path: str) -> Optional[str]:
+    """An exact path entry wins over a bare filename entry."""
+    return mapping.get(path) or mapping.get(posixpath.basename(path))
+
+
+def iter_resume_files(source: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield (relative path, content) pairs from a directory or an archive."""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    full_path = os.path.join(root, name)
+                    with open(full_path, "rb") as f:
+                        yield normalize_path(os.path.relpath(full_path, source)), f.read()
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield normalize_path(info.filename), archive.read(info)
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield normalize_path(member.name), archive.extractfile(member).read()
+    else:
+        raise ValueError(f"Source '{source}' is not a directory or a supported archive")
+
+
+def batched(items: Iterator, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# --- Checkpoint ---
+
+class Checkpoint:
+    """Tracks which files have been handled so a run can be resumed."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                done = json.load(f).get("done", {})
+            # Older runs checkpointed unmapped files; retry them in case the mapping was fixed
+            self.done = {key: outcome for key, outcome in done.items() if outcome != "unmapped"}
+            print(f"Resuming from checkpoint {path}: {len(self.done)} files already handled")
+
+    def is_done(self, path: str) -> bool:
+        return path in self.done
+
+    def mark(self, path: str, outcome: str):
+        self.done[path] = outcome
+
+    def save(self):
+        # Write to a temp file first so a crash never leaves a truncated checkpoint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"done": self.done, "updated_at": datetime.utcnow().isoformat()}, f)
+        os.replace(tmp_path, self.path)
+
+
+# --- Pipeline stages ---
+
+def _extract_text_worker(content: bytes, filename: str) -> Tuple[str, float]:
+    """Runs inside the process pool; returns the extracted text and time taken."""
+    start = time.perf_counter()
+    text = extract_text_from_upload(content, filename)
+    return text or "", time.perf_counter() - start
+
+
+class IngestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.ingested = 0
+        self.skipped = 0
+        self.failed = 0
+        self.extract_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.write_seconds = 0.0
+
+    def report(self, label: str = "Progress"):
+        elapsed = time.perf_counter() - self.started
+        handled = self.ingested + self.failed
+        rate = handled / elapsed if elapsed > 0 else 0.0
+        print(
+            f"{label}: ingested={self.ingested} failed={self.failed} skipped={self.skipped} "
+            f"elapsed={elapsed:.1f}s throughput={rate:.2f} files/s "
+            f"(extract={self.extract_seconds:.1f}s parse={self.parse_seconds:.1f}s write={self.write_seconds:.1f}s)"
+        )
+
+
+async def _process_file(
+    path: str,
+    content: bytes,
+    pool: ProcessPoolExecutor,
+    semaphore: asyncio.Semaphore,
+    stats: IngestStats,
+) -> Dict:
+    """Extract and parse one resume. Returns a result dict for the batch writer."""
+    filename = posixpath.basename(path)
+    validation = validate_file_constraints(content, filename)
+    if not validation["valid"]:
+        return {"path": path, "outcome": "invalid", "error": validation["errors"][0]}
+
+    loop = asyncio.get_running_loop()
+    try:
+        resume_text, extract_time = await loop.run_in_executor(pool, _extract_text_worker, content, filename)
+    except Exception as e:
+        return {"path": path, "outcome": "extract_failed", "error": str(e)}
+    stats.extract_seconds += extract_time
+
+    if not resume_text.strip():
+        return {"path": path, "outcome": "empty", "error": "No text extracted"}
+
+    # Bound the number of in-flight Gemini requests
+    async with semaphore:
+        start = time.perf_counter()
+        result = await parse_resume_structured(resume_text)
+        stats.parse_seconds += time.perf_counter() - start
+
+    if result.get("error") == "resume_unfit":
+        return {"path": path, "outcome": "unfit", "error": "Document is not a valid resume"}
+    if "error" in result:
+        # Treated as transient: not checkpointed, so the next run retries it
+        return {"path": path, "outcome": "retry", "error": result.get("error")}
+
+    return {
+        "path": path,
+        "outcome": "parsed",
+        "content": content,
+        "resume_text": resume_text,
+        "parsed_data": result.get("parsed_data", {}),
+    }
+
+
+def _write_batch(results: List[Dict], mapping: Dict[str, str]) -> Dict[str, str]:
+    """Write parsed resumes to UserProfile rows in one transaction. Returns outcome per file."""
+    outcomes = {}
+    parsed = [r for r in results if r["outcome"] == "parsed"]
+    if not parsed:
+        return outcomes
+
+    db = SessionLocal()
+    try:
+        emails = {mapped_email(mapping, r["path"]) for r in parsed}
+        users = db.query(models.User).filter(func.lower(models.User.user_id).in_(emails)).all()
+        users_by_email = {user.user_id.lower(): user for user in users}
+
+        profiles = db.query(models.UserProfile).filter(
+            models.UserProfile.user_id.in_([user.id for user in users])
+        ).all()
+        profiles_by_user = {profile.user_id: profile for profile in profiles}
+
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        for result in parsed:
+            user = users_by_email.get(mapped_email(mapping, result["path"]))
+            if not user:
+                outcomes[result["path"]] = "unknown_user"
+                continue
+
+            profile = profiles_by_user.get(user.id)
+            if not profile:
+                profile = models.UserProfile(user_id=user.id)
+                db.add(profile)
+                profiles_by_user[user.id] = profile
+
+            # Flatten the path so same-named files from different folders don't collide
+            file_path = os.path.join(UPLOAD_DIR, f"{user.id}_{result['path'].replace('/', '_')}")
+            with open(file_path, "wb") as f:
+                f.write(result["content"])
+
+            profile.resume_location = file_path
+            profile.resume_text = result["resume_text"]
+            profile.resume_parsed = result["parsed_data"]
+            profile.resume_remarks = None  # Generated lazily on first request
+            profile.last_updated = datetime.utcnow()
+            outcomes[result["path"]] = "ingested"
+
+        db.commit()
+        return outcomes
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def ingest(
+    source: str,
+    mapping_path: str,
+    checkpoint_path: str,
+    workers: int,
+    concurrency: int,
+    batch_size: int,
+) -> IngestStats:
+    mapping = load_user_mapping(mapping_path)
+    checkpoint = Checkpoint(checkpoint_path)
+    stats = IngestStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    def pending_files():
+        for path, content in iter_resume_files(source):
+            if checkpoint.is_done(path):
+                stats.skipped += 1
+                continue
+            if not mapped_email(mapping, path):
+                # Not checkpointed, so a later run picks it up once the mapping lists it
+                print(f"No user mapping for {path}, skipping")
+                stats.skipped += 1
+                continue
+            yield path, content
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in batched(pending_files(), batch_size):
+            results = await asyncio.gather(*[
+                _process_file(path, content, pool, semaphore, stats)
+                for path, content in batch
+            ])
+
+            start = time.perf_counter()
+            # Database writes are synchronous, keep them off the event loop
+            written = await loop.run_in_executor(None, _write_batch, results, mapping)
+            stats.write_seconds += time.perf_counter() - start
+
+            for result in results:
+                path = result["path"]
+                outcome = written.get(path, result["outcome"])
+                if outcome == "ingested":
+                    stats.ingested += 1
+                else:
+                    stats.failed += 1
+                    print(f"Failed to ingest {path}: {result.get('error') or outcome}")
+                if outcome != "retry":
+                    checkpoint.mark(path, outcome)
+
+            checkpoint.save()
+            stats.report()
+
+    checkpoint.save()
+    stats.report("Finished")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Bulk ingest resumes into user profiles.")
+    parser.add_argument("source", help="Directory or .zip/.tar archive containing PDF/DOCX resumes")
+    parser.add_argument("--mapping", required=True, help="CSV file with 'filename' and 'user_email' columns")
+    parser.add_argument("--checkpoint", default="bulk_ingest_checkpoint.json", help="Checkpoint file used to resume runs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Processes used for text extraction")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent Gemini parsing requests")
+    parser.add_argument("--batch-size", type=int, default=50, help="Profiles written per database transaction")
+    args = parser.parse_args(argv)
+
+    asyncio.run(ingest(
+        source=args.source,
+        mapping_path=args.mapping,
+        checkpoint_path=args.checkpoint,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+OTP Concurrency Check
+
+Checks that OTP verification is atomic: many threads verify the same correct
+code at the same moment and exactly one of them may succeed. Also checks that
+an OTP is revoked after OTP_MAX_ATTEMPTS wrong codes and that a check with
+is_otp_valid does not consume it.
+
+Runs against the OTP database in Redis (see redis_client.py), and against the in-memory fallback store
+with --fallback. Exits non-zero if any check fails.
+
+Usage (from the BackEnd directory):
+    python -m scripts.check_otp_concurrency [--threads 50] [--rounds 20] [--fallback]
+"""
+
+import argparse
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from services.otp_service import OTP_MAX_ATTEMPTS, OTPService
+
+PURPOSE = "concurrency_check"
+
+
+def concurrent_verifies(service: OTPService, threads: int) -> int:
+    identifier = f"{uuid.uuid4().hex}@example.com"
+    otp = service.generate_otp()
+    service.store_otp(identifier, otp, PURPOSE, ttl_minutes=1, additional_data={"marker": "ok"})
+
+    barrier = threading.Barrier(threads)
+
+    def verify():
+        barrier.wait()
+        return service.verify_otp(identifier, otp, PURPOSE)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda _: verify(), range(threads)))
+    successes = [result for result in results if result is not None]
+    if successes and successes[0] != {"marker": "ok"}:
+        print(f"Unexpected data returned: {successes[0]}")
+    return len(successes)
+
+
+def attempt_limit(service: OTPService) -> bool:
+    identifier = f"{uuid.uuid4().hex}@example.com"
+    otp = service.generate_otp()
+    wrong = "x" * len(otp)
+    service.store_otp(identifier, otp, PURPOSE, ttl_minutes=1)
+
+    if not service.is_otp_valid(identifier, otp, PURPOSE):
+        print("is_otp_valid rejected the correct code")
+        return False
+    for _ in range(OTP_MAX_ATTEMPTS):
+        service.verify_otp(identifier, wrong, PURPOSE)
+    # The correct code must no longer work once the attempts are used up
+    return service.verify_otp(identifier, otp, PURPOSE) is None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=50, help="Concurrent verifies per round")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--fallback", action="store_true", help="Test the in-memory fallback store instead of Redis")
+    args = parser.parse_args()
+
+    service = OTPService()
+    if args.fallback:
+        # Keep Redis in backoff for the whole run
+        service._redis_skip_until = time.monotonic() + 3600
+
+    failures = 0
+    for round_number in range(1, args.rounds + 1):
+        successes = concurrent_verifies(service, args.threads)
+        if successes != 1:
+            failures += 1
+            print(f"Round {round_number}: {successes} of {args.threads} concurrent verifies succeeded, expected 1")
+
+    if not attempt_limit(service):
+        failures += 1
+        print(f"OTP still accepted after {OTP_MAX_ATTEMPTS} wrong attempts")
+
+    store = "fallback store" if args.fallback else "Redis"
+    if failures:
+        print(f"FAILED: {failures} check(s) failed against {store}")
+        sys.exit(1)
+    print(f"OK: {args.rounds} rounds x {args.threads} threads, exactly one verify succeeded each time ({store}); "
+          f"OTP revoked after {OTP_MAX_ATTEMPTS} wrong attempts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Redis Cache Helpers
+
+Small JSON get/set/delete helpers around the shared Redis clients. They fail
+open: if Redis is down or slow, reads return None and writes are skipped, so
+callers fall back to the database instead of failing the request.
+"""
+
+import json
+from typing import Any, Optional
+
+from redis_client import async_redis_client, redis_client
+
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    try:
+        value = await async_redis_client.get(key)
+        return json.loads(value) if value is not None else None
+    except Exception as e:
+        print(f"Cache read failed for {key}: {e}")
+        return None
+
+
+async def cache_set_json(key: str, value: Any, ttl: int):
+    try:
+        await async_redis_client.set(key, json.dumps(value, default=str), ex=ttl)
+    except Exception as e:
+        print(f"Cache write failed for {key}: {e}")
+
+
+async def cache_delete(*keys: str):
+    try:
+        if keys:
+            await async_redis_client.delete(*keys)
+    except Exception as e:
+        print(f"Cache delete failed for {keys}: {e}")
+
+
+# --- Sync variants for Celery tasks and scripts ---
+
+def cache_get_json_sync(key: str) -> Optional[Any]:
+    try:
+        value = redis_client.get(key)
+        return json.loads(value) if value is not None else None
+    except Exception as e:
+        print(f"Cache read failed for {key}: {e}")
+        return None
+
+
+def cache_set_json_sync(key: str, value: Any, ttl: int):
+    try:
+        redis_client.set(key, json.dumps(value, default=str), ex=ttl)
+    except Exception as e:
+        print(f"Cache write failed for {key}: {e}")
+
+
+def cache_delete_sync(*keys: str):
+    try:
+        if keys:
+            redis_client.delete(*keys)
+    except Exception as e:
+        print(f"Cache delete failed for {keys}: {e}")
@@ -0,0 +1,53 @@
+"""
+Contact Statistics Service
+
+Admin dashboard counts for contact messages, computed with one GROUP BY over
+(status, contact_type) and cached in Redis. The contact router drops the
+cached entry after every submit and resolve.
+"""
+
+import os
+from typing import Dict
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from services.cache import cache_delete, cache_get_json, cache_set_json
+
+CONTACT_STATS_CACHE_KEY = "contact_stats"
+CONTACT_STATS_CACHE_TTL = int(os.getenv("CONTACT_STATS_CACHE_TTL", 600))
+CONTACT_TYPES = ("feedback", "query", "support")
+
+
+async def fetch_contact_stats(db: AsyncSession) -> Dict:
+    cached = await cache_get_json(CONTACT_STATS_CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(models.Contact.status, models.Contact.contact_type, func.count())
+        .group_by(models.Contact.status, models.Contact.contact_type)
+    )
+
+    stats = {
+        "total_contacts": 0,
+        "pending_contacts": 0,
+        "resolved_contacts": 0,
+        "by_type": {contact_type: 0 for contact_type in CONTACT_TYPES},
+    }
+    for status, contact_type, count in result.all():
+        stats["total_contacts"] += count
+        if status == models.ContactStatus.pending:
+            stats["pending_contacts"] += count
+        elif status == models.ContactStatus.resolved:
+            stats["resolved_contacts"] += count
+        if contact_type in stats["by_type"]:
+            stats["by_type"][contact_type] += count
+
+    await cache_set_json(CONTACT_STATS_CACHE_KEY, stats, CONTACT_STATS_CACHE_TTL)
+    return stats
+
+
+async def invalidate_contact_stats():
+    await cache_delete(CONTACT_STATS_CACHE_KEY)
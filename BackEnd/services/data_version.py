@@ -0,0 +1,152 @@
+"""
+Per-user data versions and conditional GET.
+
+Each user has an opaque version token in Redis (data_version:{user_id}) that
+is replaced whenever a transaction touching their profile, account or job
+matches commits. Read endpoints derive a weak ETag from the token and the query
+string, so a client repeating a request with If-None-Match gets a 304 before
+any query runs or anything is serialized.
+
+The version is read before the route queries the database and bumped only
+after commit, so a response is never labelled with a version newer than its
+data. Writes that bypass the ORM unit of work (bulk UPDATE/DELETE statements)
+must call mark_data_changed() themselves.
+
+If Redis is unavailable, reads return no version and endpoints simply respond
+200 without an ETag.
+
+When a read replica is configured, the same bump also marks the user as having
+written recently, which services/read_routing.py uses to keep their reads on
+the primary for READ_YOUR_WRITES_SECONDS.
+"""
+
+import hashlib
+import os
+import secrets
+from typing import Optional, Set
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+import models
+from auth.dependencies import get_current_user_id
+from database import REPLICA_ENABLED
+from redis_client import async_redis_client
+from services.post_commit import set_after_commit
+
+# Versions are recreated on demand, the TTL only keeps idle users from piling up
+DATA_VERSION_TTL = int(os.getenv("DATA_VERSION_TTL", 86400))
+
+
+def data_version_key(user_id: int) -> str:
+    return f"data_version:{user_id}"
+
+
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", 15))
+
+
+def recent_write_key(user_id: int) -> str:
+    return f"recent_write:{user_id}"
+
+
+async def get_data_version(user_id: int) -> Optional[str]:
+    key = data_version_key(user_id)
+    try:
+        version = await async_redis_client.get(key)
+        if version is None:
+            candidate = secrets.token_hex(8)
+            if await async_redis_client.set(key, candidate, nx=True, ex=DATA_VERSION_TTL):
+                version = candidate
+            else:
+                version = await async_redis_client.get(key)
+        return version
+    except Exception as e:
+        print(f"Data version read failed for user {user_id}: {e}")
+        return None
+
+
+def bump_after_commit(session, *user_ids: int):
+    """Give each user a new version token once the session's transaction commits."""
+    for user_id in user_ids:
+        # If the bump fails, dropping the key still retires the old version:
+        # the next read creates a fresh one and answers 200
+        set_after_commit(
+            session, data_version_key(user_id), secrets.token_hex(8), DATA_VERSION_TTL, delete_on_failure=True
+        )
+        if REPLICA_ENABLED:
+            set_after_commit(session, recent_write_key(user_id), "1", READ_YOUR_WRITES_SECONDS)
+
+
+def mark_data_changed(session, user_id: int):
+    """Bump the user's data version when the current transaction commits."""
+    bump_after_commit(session, user_id)
+
+
+# --- Conditional GET ---
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore W/ prefixes
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def conditional_get(scope: str):
+    """
+    Dependency answering 304 Not Modified when the client's ETag is current.
+
+    Otherwise the ETag is set on the response and the route runs as usual.
+    """
+    async def dependency(
+        request: Request,
+        response: Response,
+        current_user_id: int = Depends(get_current_user_id),
+    ):
+        version = await get_data_version(current_user_id)
+        if version is None:
+            return
+        digest = hashlib.blake2b(f"{scope}|{version}|{request.url.query}".encode(), digest_size=12).hexdigest()
+        headers = {
+            "ETag": f'W/"{digest}"',
+            "Cache-Control": "private, no-cache",
+            "Vary": "Authorization",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
+
+
+def drop_etag(response: Response):
+    """For routes that fall back to a placeholder body on errors: don't let it be cached."""
+    del response.headers["ETag"]
+
+
+# --- Version bump hooks ---
+
+def _changed_user_id(obj) -> Optional[int]:
+    # Read from the loaded state so deleted rows never trigger a lazy load
+    loaded = inspect(obj).dict
+    if isinstance(obj, models.User):
+        return loaded.get("id")
+    if isinstance(obj, (models.UserProfile, models.JobMatch)):
+        return loaded.get("user_id")
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_data(session: Session, flush_context):
+    changed: Set[int] = set()
+    dirty = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in (*session.new, *dirty, *session.deleted):
+        user_id = _changed_user_id(obj)
+        if user_id is not None:
+            changed.add(user_id)
+    if changed:
+        # Sent by services/post_commit.py, which also drops it on rollback
+        bump_after_commit(session, *changed)
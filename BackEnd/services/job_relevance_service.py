@@ -12,23 +12,23 @@ import random
 import asyncio
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from concurrent.futures import ThreadPoolExecutor
 
-import google.generativeai as genai
 from dotenv import load_dotenv
 
 import models
 from database import get_db
+from utils.gemini import generative_model
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini API
+# Gemini is imported and configured on first use (utils.gemini)
 api_key = os.getenv("GOOGLE_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
-else:
+if not api_key:
     print("WARNING: GOOGLE_API_KEY not found. Job relevance matching will use fallback method.")
 
 
@@ -60,9 +60,6 @@ class JobRelevanceCalculator:
             return 0.1
         
         try:
-            # Configure the Gemini model
-            model = genai.GenerativeModel('gemini-1.5-flash-latest')
-            
             # Extract resume information for comparison
             resume_summary = self._extract_resume_summary(resume_data)
             
@@ -135,7 +132,8 @@ class JobRelevanceCalculator:
             
             # Make API call using ThreadPoolExecutor with timeout
             def sync_generate():
-                response = model.generate_content(prompt)
+                # Built in the worker: the first call may still import the SDK
+                response = generative_model().generate_content(prompt)
                 return response.text
             
             loop = asyncio.get_event_loop()
@@ -343,13 +341,16 @@ class JobRelevanceCalculator:
 
 
 # Service functions for database integration
-async def calculate_job_relevance_for_new_match(job_match_id: int, db: Session) -> Optional[float]:
+async def calculate_job_relevance_for_new_match(job_match_id: int, db: AsyncSession) -> Optional[float]:
     """Calculate relevance score for a newly created job match."""
     try:
-        # Get the job match record
-        job_match = db.query(models.JobMatch).filter(
-            models.JobMatch.id == job_match_id
-        ).first()
+        # Get the job match record together with its job
+        result = await db.execute(
+            select(models.JobMatch)
+            .where(models.JobMatch.id == job_match_id)
+            .options(selectinload(models.JobMatch.job))
+        )
+        job_match = result.scalars().first()
         
         if not job_match:
             print(f"Job match {job_match_id} not found")
@@ -361,18 +362,20 @@ async def calculate_job_relevance_for_new_match(job_match_id: int, db: Session)
             return job_match.relevance_score
         
         # Get user profile with resume data
-        user_profile = db.query(models.UserProfile).filter(
-            models.UserProfile.user_id == job_match.user_id
-        ).first()
+        result = await db.execute(
+            select(models.UserProfile).where(models.UserProfile.user_id == job_match.user_id)
+        )
+        user_profile = result.scalars().first()
         
         if not user_profile or not user_profile.resume_parsed:
             print(f"No resume data found for user {job_match.user_id}")
             return None
         
         # Get job information
-        job_description = job_match.job_description or ""
-        job_title = job_match.job_title or ""
-        job_requirements = getattr(job_match, 'job_requirements', "") or ""
+        job = job_match.job
+        job_description = (job.job_description if job else "") or ""
+        job_title = (job.job_title if job else "") or ""
+        job_requirements = (job.job_required_skills if job else "") or ""
         
         if not job_description:
             print(f"No job description found for job match {job_match_id}")
@@ -389,13 +392,13 @@ async def calculate_job_relevance_for_new_match(job_match_id: int, db: Session)
         
         # Update the database
         job_match.relevance_score = relevance_score
-        db.commit()
+        await db.commit()
         
         print(f"Calculated relevance score for new job match {job_match_id}: {relevance_score:.2f}")
         return relevance_score
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error calculating job relevance for match {job_match_id}: {e}")
         return None
 
@@ -0,0 +1,291 @@
+"""
+Job Match Statistics Service
+
+Dashboard counters for a user's job matches, stored in user_match_stats and
+cached per user in Redis.
+
+The counters are maintained incrementally in the same transaction as the
+job_matches change: an after_flush hook turns inserted, updated and deleted
+JobMatch rows into per-user deltas and applies them under a row lock; a user's
+first write builds the row from job_matches. The "recent" counter is kept as
+hourly buckets: the current hour plus the 23 full hours before it. Changes
+the ORM does not see (bulk UPDATE/DELETE statements, database cascades) must
+call mark_match_stats_dirty() so the user's row is recomputed before commit;
+the nightly reconciliation task repairs anything else. The cached copy is
+dropped after commit through services/post_commit.py.
+
+The hooks are registered on import; models.py imports this module, so every
+process that writes job matches has them.
+"""
+
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import models
+from services.cache import cache_get_json, cache_set_json
+from services.post_commit import delete_after_commit
+
+MATCH_STATS_CACHE_TTL = int(os.getenv("MATCH_STATS_CACHE_TTL", 300))
+HIGH_RELEVANCE_THRESHOLD = 0.7
+RECENT_WINDOW_HOURS = 24
+
+COUNTER_COLUMNS = ("total_matches", "high_relevance_jobs", "applied_jobs", "not_interested_jobs")
+
+_stats_table = models.UserMatchStats.__table__
+
+
+def match_stats_key(user_id: int) -> str:
+    return f"match_stats:{user_id}"
+
+
+# --- Buckets ---
+
+def _bucket(created_at: Optional[datetime]) -> Optional[str]:
+    return created_at.strftime("%Y-%m-%dT%H") if created_at else None
+
+
+def _window_start(now: Optional[datetime] = None) -> str:
+    # Buckets are hourly: the current partial hour plus the 23 full hours before
+    # it, so "recent" covers between 23 and 24 hours and never more
+    return _bucket((now or datetime.utcnow()) - timedelta(hours=RECENT_WINDOW_HOURS - 1))
+
+
+def _prune_buckets(buckets: Dict[str, int]) -> Dict[str, int]:
+    start = _window_start()
+    return {hour: count for hour, count in buckets.items() if hour >= start and count > 0}
+
+
+def recent_from_buckets(buckets: Optional[Dict[str, int]]) -> int:
+    start = _window_start()
+    return sum(count for hour, count in (buckets or {}).items() if hour >= start)
+
+
+def stats_from_row(row) -> Dict[str, int]:
+    stats = {column: getattr(row, column) or 0 for column in COUNTER_COLUMNS}
+    stats["recent_matches"] = recent_from_buckets(row.recent_buckets)
+    return stats
+
+
+# --- Recompute ---
+
+def match_stats_query(user_id: int):
+    """One pass over the user's matches for every counter."""
+    return select(
+        func.count().label("total_matches"),
+        func.count().filter(
+            models.JobMatch.relevance_score >= HIGH_RELEVANCE_THRESHOLD
+        ).label("high_relevance_jobs"),
+        func.count().filter(
+            models.JobMatch.status == models.JobMatchStatus.applied
+        ).label("applied_jobs"),
+        func.count().filter(
+            models.JobMatch.status == models.JobMatchStatus.not_interested
+        ).label("not_interested_jobs"),
+    ).where(models.JobMatch.user_id == user_id)
+
+
+def compute_user_match_stats(connection, user_id: int):
+    """Counters and recent buckets computed from job_matches, without writing anything."""
+    counters = dict(connection.execute(match_stats_query(user_id)).mappings().one())
+
+    hour = func.date_trunc("hour", models.JobMatch.created_at)
+    bucket_rows = connection.execute(
+        select(hour, func.count())
+        .where(
+            models.JobMatch.user_id == user_id,
+            models.JobMatch.created_at >= datetime.utcnow() - timedelta(hours=RECENT_WINDOW_HOURS),
+        )
+        .group_by(hour)
+    ).all()
+    buckets = _prune_buckets({_bucket(bucket_hour): count for bucket_hour, count in bucket_rows})
+    return counters, buckets
+
+
+def reconcile_user_match_stats(connection, user_id: int) -> bool:
+    """Recompute a user's counters from job_matches. Returns True if the stored row drifted."""
+    counters, buckets = compute_user_match_stats(connection, user_id)
+
+    existing = connection.execute(
+        select(_stats_table).where(_stats_table.c.user_id == user_id).with_for_update()
+    ).mappings().first()
+    values = {**counters, "recent_buckets": buckets, "updated_at": datetime.utcnow()}
+
+    if existing is None:
+        connection.execute(pg_insert(_stats_table).values(user_id=user_id, **values).on_conflict_do_update(
+            index_elements=["user_id"], set_=values
+        ))
+        return any(counters.values())
+
+    drifted = any(existing[column] != counters[column] for column in COUNTER_COLUMNS) or \
+        _prune_buckets(existing["recent_buckets"] or {}) != buckets
+    if drifted:
+        connection.execute(update(_stats_table).where(_stats_table.c.user_id == user_id).values(**values))
+    return drifted
+
+
+# --- Incremental maintenance ---
+
+def _as_status(value) -> models.JobMatchStatus:
+    """Attribute values are whatever the writer assigned, so accept names and values too."""
+    if value is None:
+        return models.JobMatchStatus.pending
+    if isinstance(value, models.JobMatchStatus):
+        return value
+    if value in models.JobMatchStatus.__members__:
+        return models.JobMatchStatus[value]
+    return models.JobMatchStatus(value)
+
+
+def _contribution(values: Dict) -> Counter:
+    """What one job_matches row adds to its user's counters."""
+    status = _as_status(values.get("status"))
+    score = values.get("relevance_score")
+    return Counter({
+        "total_matches": 1,
+        "high_relevance_jobs": int(score is not None and score >= HIGH_RELEVANCE_THRESHOLD),
+        "applied_jobs": int(status == models.JobMatchStatus.applied),
+        "not_interested_jobs": int(status == models.JobMatchStatus.not_interested),
+    })
+
+
+def _apply_deltas(connection, user_id: int, deltas: Counter, bucket_deltas: Counter):
+    # Row lock serialises concurrent writers for the same user until commit
+    row = connection.execute(
+        select(_stats_table).where(_stats_table.c.user_id == user_id).with_for_update()
+    ).mappings().first()
+    if row is None:
+        # First write since the user had a stats row: build it from job_matches,
+        # which already includes this flush, instead of adding deltas to zero
+        reconcile_user_match_stats(connection, user_id)
+        return
+
+    values = {column: max(0, row[column] + deltas.get(column, 0)) for column in COUNTER_COLUMNS}
+    buckets = Counter(row["recent_buckets"] or {})
+    buckets.update(bucket_deltas)
+    values["recent_buckets"] = _prune_buckets(dict(buckets))
+    values["updated_at"] = datetime.utcnow()
+    connection.execute(update(_stats_table).where(_stats_table.c.user_id == user_id).values(**values))
+
+
+def _invalidate_after_commit(session, user_ids):
+    delete_after_commit(session, *[match_stats_key(user_id) for user_id in user_ids])
+
+
+def mark_match_stats_dirty(session, user_id: int):
+    """Recompute the user's counters before the current transaction commits."""
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    sync_session.info.setdefault("match_stats_dirty", set()).add(user_id)
+    _invalidate_after_commit(sync_session, [user_id])
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_match_stats(session: Session, flush_context):
+    deltas: Dict[int, Counter] = {}
+    bucket_deltas: Dict[int, Counter] = {}
+    dirty = session.info.setdefault("match_stats_dirty", set())
+
+    def add(user_id: int, values: Dict, sign: int, count_bucket: bool = True):
+        delta = deltas.setdefault(user_id, Counter())
+        for column, count in _contribution(values).items():
+            delta[column] += sign * count
+        bucket = _bucket(values.get("created_at")) if count_bucket else None
+        if bucket:
+            bucket_deltas.setdefault(user_id, Counter())[bucket] += sign
+
+    for obj in session.new:
+        if isinstance(obj, models.JobMatch):
+            add(obj.user_id, inspect(obj).dict, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, models.JobMatch):
+            loaded = inspect(obj).dict
+            if all(key in loaded for key in ("user_id", "status", "relevance_score", "created_at")):
+                add(loaded["user_id"], loaded, -1)
+            elif "user_id" in loaded:
+                dirty.add(loaded["user_id"])
+
+    for obj in session.dirty:
+        if not isinstance(obj, models.JobMatch):
+            continue
+        state = inspect(obj)
+        changed = [attr for attr in ("status", "relevance_score", "user_id") if state.attrs[attr].history.has_changes()]
+        if not changed:
+            continue
+        if "user_id" in changed:
+            dirty.update(value for value in state.attrs.user_id.history.sum() if value is not None)
+            continue
+
+        old_values = dict(state.dict)
+        for attr in changed:
+            history = state.attrs[attr].history
+            if not history.deleted:
+                # Previous value was never loaded, fall back to a recompute
+                dirty.add(obj.user_id)
+                break
+            old_values[attr] = history.deleted[0]
+        else:
+            # created_at does not change, so the recent bucket stays as it is
+            add(obj.user_id, old_values, -1, count_bucket=False)
+            add(obj.user_id, state.dict, 1, count_bucket=False)
+
+    if not deltas and not dirty:
+        return
+
+    connection = session.connection()
+    for user_id, delta in deltas.items():
+        if user_id in dirty:
+            continue
+        _apply_deltas(connection, user_id, delta, bucket_deltas.get(user_id, Counter()))
+    _invalidate_after_commit(session, deltas)
+
+
+@event.listens_for(Session, "before_commit")
+def _reconcile_dirty_match_stats(session: Session):
+    dirty = session.info.pop("match_stats_dirty", None)
+    if dirty:
+        connection = session.connection()
+        for user_id in dirty:
+            reconcile_user_match_stats(connection, user_id)
+        _invalidate_after_commit(session, dirty)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_match_stats_changes(session: Session):
+    # The queued cache invalidations are dropped by services/post_commit.py
+    session.info.pop("match_stats_dirty", None)
+
+
+# --- Reads ---
+
+async def get_match_stats(db: AsyncSession, user_id: int) -> Dict[str, int]:
+    """
+    Dashboard stats from the cache, falling back to the user_match_stats row.
+    Read only: a user without a row gets counters computed from job_matches,
+    and the row itself is created by their next match write or the nightly
+    reconciliation.
+    """
+    cached = await cache_get_json(match_stats_key(user_id))
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(models.UserMatchStats).where(models.UserMatchStats.user_id == user_id)
+    )
+    row = result.scalars().first()
+    if row is not None:
+        stats = stats_from_row(row)
+    else:
+        counters, buckets = await db.run_sync(
+            lambda session: compute_user_match_stats(session.connection(), user_id)
+        )
+        stats = {**counters, "recent_matches": recent_from_buckets(buckets)}
+
+    await cache_set_json(match_stats_key(user_id), stats, MATCH_STATS_CACHE_TTL)
+    return stats
@@ -1,229 +1,312 @@
 import redis
-import random
+import hmac
+import secrets
 import string
 import os
-import json
+import threading
 import time
 from typing import Optional, Dict, Any
 from datetime import timedelta
 
+from redis_client import get_redis
+
+# After a connection failure Redis is skipped for a while, doubling up to the cap
+OTP_REDIS_BACKOFF_BASE = float(os.getenv("OTP_REDIS_BACKOFF_BASE", 1.0))
+OTP_REDIS_BACKOFF_CAP = float(os.getenv("OTP_REDIS_BACKOFF_CAP", 30.0))
+# Wrong codes allowed before the OTP is revoked and a new one must be requested
+OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", 5))
+# In-memory fallback: entry limit and how often expired entries are swept
+OTP_FALLBACK_MAX_ENTRIES = int(os.getenv("OTP_FALLBACK_MAX_ENTRIES", 10000))
+OTP_FALLBACK_SWEEP_SECONDS = float(os.getenv("OTP_FALLBACK_SWEEP_SECONDS", 30))
+
+
+# Check-and-consume in one atomic step. KEYS[1]: OTP hash. ARGV: submitted code,
+# max attempts, "1" to consume on success. Returns {"ok", fields...},
+# {"invalid"}, {"locked"} (too many wrong codes, OTP revoked) or {"missing"}.
+_VERIFY_OTP_SCRIPT = """
+local stored = redis.call('HGET', KEYS[1], 'otp')
+if not stored then
+    return {'missing'}
+end
+if stored == ARGV[1] then
+    local fields = redis.call('HGETALL', KEYS[1])
+    if ARGV[3] == '1' then
+        redis.call('DEL', KEYS[1])
+    end
+    table.insert(fields, 1, 'ok')
+    return fields
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return {'locked'}
+end
+return {'invalid'}
+"""
+
+# Bookkeeping fields of the stored hash, not returned to callers
+_INTERNAL_FIELDS = ("otp", "attempts")
+
+
+def _check_otp(data: Dict[str, Any], otp_code: str, consume: bool):
+    """
+    Same rules as _VERIFY_OTP_SCRIPT for the fallback store, applied to `data`
+    in place. Returns (outcome, keep_entry).
+    """
+    if hmac.compare_digest(str(data.get("otp", "")), otp_code):
+        return "ok", not consume
+    data["attempts"] = int(data.get("attempts", 0)) + 1
+    if data["attempts"] >= OTP_MAX_ATTEMPTS:
+        return "locked", False
+    return "invalid", True
+
+
+class TTLStore:
+    """
+    Bounded in-memory dict with per-entry expiry, used when Redis is unreachable.
+
+    Expired entries are removed by a background sweeper thread (started with the
+    first entry) and on access. When full, the entries closest to expiring are
+    evicted first. Per process only: with several workers an OTP stored here is
+    only visible to the worker that stored it.
+    """
+
+    def __init__(self, max_entries: int, sweep_seconds: float):
+        self.max_entries = max_entries
+        self.sweep_seconds = sweep_seconds
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._sweeper = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set(self, key: str, data: Dict[str, Any], ttl_seconds: float):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + ttl_seconds, data)
+            if len(self._entries) > self.max_entries:
+                self._sweep_locked()
+                while len(self._entries) > self.max_entries:
+                    evicted = min(self._entries, key=lambda k: self._entries[k][0])
+                    del self._entries[evicted]
+                    print(f"⚠️ OTP fallback storage full, evicted {evicted}")
+            self._start_sweeper()
+
+    def _live_entry(self, key: str) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry and entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._live_entry(key)
+            return entry[1] if entry else None
+
+    def pop(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry:
+                del self._entries[key]
+            return entry[1] if entry else None
+
+    def apply(self, key: str, func):
+        """
+        Run func(data) on a live entry under the store's lock; func returns
+        (result, keep). Returns None if the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._live_entry(key)
+            if not entry:
+                return None
+            result, keep = func(entry[1])
+            if not keep:
+                del self._entries[key]
+            return result
+
+    def ttl(self, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._live_entry(key)
+            return int(entry[0] - time.monotonic()) if entry else None
+
+    def sweep(self) -> int:
+        with self._lock:
+            return self._sweep_locked()
+
+    def _sweep_locked(self) -> int:
+        now = time.monotonic()
+        expired = [key for key, (expiry, _) in self._entries.items() if expiry <= now]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    def _start_sweeper(self):
+        if self._sweeper is None:
+            self._sweeper = threading.Thread(target=self._sweep_forever, name="otp-fallback-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_forever(self):
+        while True:
+            time.sleep(self.sweep_seconds)
+            removed = self.sweep()
+            if removed:
+                print(f"🧹 Swept {removed} expired OTPs from fallback storage")
+
+
 class OTPService:
     def __init__(self):
-        redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
-        try:
-            self.redis_client = redis.from_url(redis_url, decode_responses=True)
-            # Test the connection
-            self.redis_client.ping()
-            print(f"✅ Connected to Redis at {redis_url}")
-        except Exception as e:
-            print(f"❌ Failed to connect to Redis at {redis_url}: {e}")
-            # Use a fallback in-memory storage for development
-            self._fallback_storage = {}
-            self.redis_client = None
-            print("🔄 Using fallback in-memory storage for OTP")
-    
-    def _is_redis_available(self) -> bool:
-        """Check if Redis connection is available"""
-        try:
-            if self.redis_client:
-                self.redis_client.ping()
-                return True
-            return False
-        except:
-            return False
-    
+        # Shared client for the OTP database; no connection is made here, and
+        # transient connection errors are retried by the client itself
+        self.redis_client = get_redis("otp")
+        self._verify_script = self.redis_client.register_script(_VERIFY_OTP_SCRIPT)
+        self._fallback_storage = TTLStore(OTP_FALLBACK_MAX_ENTRIES, OTP_FALLBACK_SWEEP_SECONDS)
+        self._redis_failures = 0
+        self._redis_skip_until = 0.0
+        self._state_lock = threading.Lock()
+
+    # --- Redis availability ---
+    # Instead of a PING before every operation, operations just run and
+    # connection errors put Redis on a short, growing backoff during which the
+    # fallback store is used directly.
+
+    def _redis(self) -> Optional[redis.Redis]:
+        return self.redis_client if time.monotonic() >= self._redis_skip_until else None
+
+    def _redis_succeeded(self):
+        if self._redis_failures:
+            with self._state_lock:
+                self._redis_failures = 0
+                self._redis_skip_until = 0.0
+            print("✅ Redis reachable again, OTPs stored in Redis")
+
+    def _redis_failed(self, action: str, error: Exception):
+        with self._state_lock:
+            self._redis_failures += 1
+            backoff = min(OTP_REDIS_BACKOFF_CAP, OTP_REDIS_BACKOFF_BASE * 2 ** (self._redis_failures - 1))
+            self._redis_skip_until = time.monotonic() + backoff
+        print(f"❌ Error {action} in Redis: {error}; using fallback storage for {backoff:.0f}s")
+
     def _generate_key(self, identifier: str, purpose: str) -> str:
         return f"otp:{purpose}:{identifier}"
-        
+
     def generate_otp(self, length: int = 6) -> str:
-        return ''.join(random.choices(string.digits, k=length))
-    
-    def store_otp(self, identifier: str, otp_code: str, purpose: str, 
+        return ''.join(secrets.choice(string.digits) for _ in range(length))
+
+    def store_otp(self, identifier: str, otp_code: str, purpose: str,
                   ttl_minutes: int = 5, additional_data: Optional[Dict] = None) -> bool:
         """Store OTP with fallback to in-memory storage if Redis is unavailable"""
         key = self._generate_key(identifier, purpose)
-        
+
         data = {"otp": otp_code}
         if additional_data:
             data.update(additional_data)
-        
+
         # Try Redis first
-        if self._is_redis_available():
+        client = self._redis()
+        if client:
             try:
-                pipe = self.redis_client.pipeline()
+                pipe = client.pipeline()
+                # Replace the whole hash so attempts from an older OTP don't carry over
+                pipe.delete(key)
                 pipe.hset(key, mapping=data)
                 pipe.expire(key, timedelta(minutes=ttl_minutes))
                 pipe.execute()
+                self._redis_succeeded()
+                # A newer OTP replaces any copy left in the fallback store
+                self._fallback_storage.pop(key)
                 print(f"✅ OTP stored in Redis for {identifier}")
                 return True
-            except Exception as e:
-                print(f"❌ Error storing OTP in Redis: {e}")
-        
+            except redis.RedisError as e:
+                self._redis_failed("storing OTP", e)
+
         # Fallback to in-memory storage
-        try:
-            import time
-            expiry_time = time.time() + (ttl_minutes * 60)
-            self._fallback_storage[key] = {
-                "data": data,
-                "expiry": expiry_time
-            }
-            print(f"✅ OTP stored in fallback storage for {identifier}")
-            return True
-        except Exception as e:
-            print(f"❌ Error storing OTP in fallback storage: {e}")
-            return False
-    
+        self._fallback_storage.set(key, data, ttl_minutes * 60)
+        print(f"✅ OTP stored in fallback storage for {identifier}")
+        return True
+
+    def _check(self, key: str, otp_code: str, consume: bool):
+        """
+        Check an OTP and count a wrong attempt in one step, consuming it on
+        success if asked. Returns (outcome, additional_data); outcome is one of
+        "ok", "invalid", "locked" or "missing".
+        """
+        client = self._redis()
+        if client:
+            try:
+                reply = self._verify_script(keys=[key], args=[otp_code, OTP_MAX_ATTEMPTS, "1" if consume else "0"])
+                self._redis_succeeded()
+                outcome = reply[0]
+                if outcome != "missing":
+                    fields = dict(zip(reply[1::2], reply[2::2]))
+                    return outcome, {k: v for k, v in fields.items() if k not in _INTERNAL_FIELDS}
+            except redis.RedisError as e:
+                self._redis_failed("verifying OTP", e)
+
+        # Also covers OTPs stored during an outage that Redis never saw
+        if not len(self._fallback_storage):
+            return "missing", {}
+
+        def check(data):
+            outcome, keep = _check_otp(data, otp_code, consume)
+            additional_data = {k: v for k, v in data.items() if k not in _INTERNAL_FIELDS} if outcome == "ok" else {}
+            return (outcome, additional_data), keep
+
+        result = self._fallback_storage.apply(key, check)
+        return result if result else ("missing", {})
+
     def verify_otp(self, identifier: str, otp_code: str, purpose: str) -> Optional[Dict]:
-        """Verify OTP with fallback to in-memory storage if Redis is unavailable"""
+        """
+        Verify and consume an OTP atomically. Returns the data stored with it,
+        or None if the code is wrong, expired or revoked after too many attempts.
+        """
         key = self._generate_key(identifier, purpose)
-        
-        print(f"🔍 Verifying OTP for key: {key}")
-        
-        # Try Redis first
-        if self._is_redis_available():
-            try:
-                stored_data = self.redis_client.hgetall(key)
-                print(f"📊 Redis stored data: {stored_data}")
-                print(f"🔑 Expected OTP: {otp_code}, Stored OTP: {stored_data.get('otp') if stored_data else 'None'}")
-                
-                if stored_data and stored_data.get("otp") == otp_code:
-                    additional_data = {k: v for k, v in stored_data.items() if k != "otp"}
-                    self.redis_client.delete(key)
-                    print(f"✅ OTP verified and deleted from Redis for {identifier}")
-                    return additional_data
-                else:
-                    print(f"❌ OTP verification failed in Redis for {identifier}")
-                    return None
-            except Exception as e:
-                print(f"❌ Error verifying OTP in Redis: {e}")
-        
-        # Fallback to in-memory storage
-        try:
-            import time
-            current_time = time.time()
-            
-            if key in self._fallback_storage:
-                stored_entry = self._fallback_storage[key]
-                print(f"📊 Fallback stored data: {stored_entry}")
-                
-                # Check if expired
-                if current_time > stored_entry["expiry"]:
-                    del self._fallback_storage[key]
-                    print(f"⏰ OTP expired in fallback storage for {identifier}")
-                    return None
-                
-                stored_data = stored_entry["data"]
-                print(f"🔑 Expected OTP: {otp_code}, Stored OTP: {stored_data.get('otp') if stored_data else 'None'}")
-                
-                if stored_data.get("otp") == otp_code:
-                    additional_data = {k: v for k, v in stored_data.items() if k != "otp"}
-                    del self._fallback_storage[key]
-                    print(f"✅ OTP verified and deleted from fallback storage for {identifier}")
-                    return additional_data
-                else:
-                    print(f"❌ OTP verification failed in fallback storage for {identifier}")
-                    return None
-            else:
-                print(f"❌ No OTP found in fallback storage for {identifier}")
-                return None
-                
-        except Exception as e:
-            print(f"❌ Error verifying OTP in fallback storage: {e}")
-            return None
-    
+
+        outcome, additional_data = self._check(key, otp_code, consume=True)
+        if outcome == "ok":
+            print(f"✅ OTP verified and consumed for {identifier}")
+            return additional_data
+
+        print(f"❌ OTP verification failed for {identifier}: {outcome}")
+        return None
+
     def is_otp_valid(self, identifier: str, otp_code: str, purpose: str) -> bool:
-        """Check OTP validity with fallback to in-memory storage if Redis is unavailable"""
+        """Check an OTP without consuming it. Wrong codes count as attempts."""
         key = self._generate_key(identifier, purpose)
-        
-        print(f"🔍 Checking OTP validity for key: {key}")
-        
-        # Try Redis first
-        if self._is_redis_available():
-            try:
-                stored_data = self.redis_client.hgetall(key)
-                print(f"📊 Redis stored data for validation: {stored_data}")
-                is_valid = bool(stored_data and stored_data.get("otp") == otp_code)
-                print(f"✅ Redis OTP valid check result: {is_valid}")
-                return is_valid
-            except Exception as e:
-                print(f"❌ Error checking OTP validity in Redis: {e}")
-        
-        # Fallback to in-memory storage
-        try:
-            import time
-            current_time = time.time()
-            
-            if key in self._fallback_storage:
-                stored_entry = self._fallback_storage[key]
-                
-                # Check if expired
-                if current_time > stored_entry["expiry"]:
-                    del self._fallback_storage[key]
-                    print(f"⏰ OTP expired in fallback storage for {identifier}")
-                    return False
-                
-                stored_data = stored_entry["data"]
-                print(f"📊 Fallback stored data for validation: {stored_data}")
-                is_valid = bool(stored_data and stored_data.get("otp") == otp_code)
-                print(f"✅ Fallback OTP valid check result: {is_valid}")
-                return is_valid
-            else:
-                print(f"❌ No OTP found in fallback storage for {identifier}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Error checking OTP validity in fallback storage: {e}")
-            return False
-    
+
+        outcome, _ = self._check(key, otp_code, consume=False)
+        print(f"🔍 OTP valid check for {identifier}: {outcome}")
+        return outcome == "ok"
+
     def delete_otp(self, identifier: str, purpose: str) -> bool:
         """Delete OTP with fallback to in-memory storage if Redis is unavailable"""
         key = self._generate_key(identifier, purpose)
-        
-        # Try Redis first
-        if self._is_redis_available():
+
+        deleted = self._fallback_storage.pop(key) is not None
+        client = self._redis()
+        if client:
             try:
-                result = self.redis_client.delete(key)
-                print(f"🗑️ OTP deleted from Redis for {identifier}: {result > 0}")
-                return result > 0
-            except Exception as e:
-                print(f"❌ Error deleting OTP from Redis: {e}")
-        
-        # Fallback to in-memory storage
-        try:
-            if key in self._fallback_storage:
-                del self._fallback_storage[key]
-                print(f"🗑️ OTP deleted from fallback storage for {identifier}")
-                return True
-            else:
-                print(f"❌ No OTP found to delete in fallback storage for {identifier}")
-                return False
-        except Exception as e:
-            print(f"❌ Error deleting OTP from fallback storage: {e}")
-            return False
-    
+                deleted = client.delete(key) > 0 or deleted
+                self._redis_succeeded()
+            except redis.RedisError as e:
+                self._redis_failed("deleting OTP", e)
+
+        print(f"🗑️ OTP deleted for {identifier}: {deleted}")
+        return deleted
+
     def get_otp_ttl(self, identifier: str, purpose: str) -> Optional[int]:
         """Get OTP TTL with fallback to in-memory storage if Redis is unavailable"""
         key = self._generate_key(identifier, purpose)
-        
-        # Try Redis first
-        if self._is_redis_available():
+
+        client = self._redis()
+        if client:
             try:
-                ttl = self.redis_client.ttl(key)
-                return ttl if ttl > 0 else None
-            except Exception as e:
-                print(f"❌ Error getting OTP TTL from Redis: {e}")
-        
-        # Fallback to in-memory storage
-        try:
-            import time
-            current_time = time.time()
-            
-            if key in self._fallback_storage:
-                stored_entry = self._fallback_storage[key]
-                remaining_time = int(stored_entry["expiry"] - current_time)
-                return remaining_time if remaining_time > 0 else None
-            else:
-                return None
-        except Exception as e:
-            print(f"❌ Error getting OTP TTL from fallback storage: {e}")
-            return None
+                ttl = client.ttl(key)
+                self._redis_succeeded()
+                if ttl > 0:
+                    return ttl
+            except redis.RedisError as e:
+                self._redis_failed("getting OTP TTL", e)
+
+        return self._fallback_storage.ttl(key)
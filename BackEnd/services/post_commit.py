@@ -0,0 +1,139 @@
+"""
+Post-Commit Redis Updates
+
+Session hooks that must touch Redis once a transaction commits (cache
+invalidation, data version bumps) queue their keys here instead of calling
+Redis from after_commit themselves. All updates of one commit go out in a
+single pipeline:
+
+- AsyncSession commits run their hooks inside the sync commit, where nothing
+  can be awaited. Batches that set keys (data versions, primary pins) must land
+  before the response, or the client's next request can read a stale version
+  or go to a lagging replica; PostCommitAsyncSession.commit awaits them with
+  the async client right after the commit. Delete-only batches (cache
+  invalidation) are safe to run late and go out in a background task.
+- Plain Session commits (Celery tasks, scripts, threadpool routes) send it
+  inline with the sync client.
+
+Like the cache helpers, failures are logged and do not fail the request; the
+deletes and any set queued with delete_on_failure are retried once as plain
+DELs. The queue is dropped on rollback.
+"""
+
+import asyncio
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_session
+from sqlalchemy.orm import Session
+
+from redis_client import async_redis_client, redis_client
+
+# key -> None to delete it, or (value, ttl seconds, delete if the set fails)
+Pending = Dict[str, Optional[Tuple[str, int, bool]]]
+
+# Keeps running tasks referenced until they finish
+_tasks: Set[asyncio.Task] = set()
+
+
+def _pending(session) -> Pending:
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    return sync_session.info.setdefault("post_commit_redis", {})
+
+
+def delete_after_commit(session, *keys: str):
+    """Delete `keys` once the session's transaction commits."""
+    pending = _pending(session)
+    for key in keys:
+        pending[key] = None
+
+
+def set_after_commit(session, key: str, value: str, ttl: int, delete_on_failure: bool = False):
+    """
+    Set `key` to `value` with a TTL once the session's transaction commits.
+    With delete_on_failure, a failed update is followed by a DEL of the key, so
+    a stale value (e.g. a data version) does not outlive the change.
+    """
+    _pending(session)[key] = (value, ttl, delete_on_failure)
+
+
+def _queue(pipe, pending: Pending):
+    deletes = [key for key, op in pending.items() if op is None]
+    if deletes:
+        pipe.delete(*deletes)
+    for key, op in pending.items():
+        if op is not None:
+            pipe.set(key, op[0], ex=op[1])
+
+
+def _fallback(pending: Pending) -> Pending:
+    """What to retry after a failed update: deletes, and sets that must not go stale."""
+    return {key: None for key, op in pending.items() if op is None or op[2]}
+
+
+def _apply_sync(pending: Pending, retry: bool = True):
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        _queue(pipe, pending)
+        pipe.execute()
+    except Exception as e:
+        print(f"Post-commit Redis update failed for {list(pending)}: {e}")
+        fallback = _fallback(pending)
+        if retry and fallback:
+            _apply_sync(fallback, retry=False)
+
+
+async def _apply_async(pending: Pending, retry: bool = True):
+    try:
+        pipe = async_redis_client.pipeline(transaction=False)
+        _queue(pipe, pending)
+        await pipe.execute()
+    except Exception as e:
+        print(f"Post-commit Redis update failed for {list(pending)}: {e}")
+        fallback = _fallback(pending)
+        if retry and fallback:
+            await _apply_async(fallback, retry=False)
+
+
+async def apply_post_commit(session):
+    """Send the updates a commit left for the caller to await. Safe to call twice."""
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    pending = sync_session.info.pop("post_commit_ready", None)
+    if pending:
+        await _apply_async(pending)
+
+
+class PostCommitAsyncSession(AsyncSession):
+    """AsyncSession whose commit returns only once its post-commit sets are in Redis."""
+
+    async def commit(self):
+        await super().commit()
+        await apply_post_commit(self)
+
+
+def _run_in_background(pending: Pending):
+    task = asyncio.get_running_loop().create_task(_apply_async(pending))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_post_commit(session: Session):
+    pending = session.info.pop("post_commit_redis", None)
+    if not pending:
+        return
+    if async_session(session) is None:
+        _apply_sync(pending)
+        return
+    must_await = any(op is not None for op in pending.values())
+    if must_await and isinstance(async_session(session), PostCommitAsyncSession):
+        # Merged in case an earlier batch (e.g. from session.begin()) was never awaited
+        session.info.setdefault("post_commit_ready", {}).update(pending)
+        return
+    _run_in_background(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_post_commit(session: Session):
+    # Only the uncommitted queue; post_commit_ready belongs to a committed transaction
+    session.info.pop("post_commit_redis", None)
@@ -0,0 +1,128 @@
+"""
+Sliding-Window Rate Limiting
+
+Redis-backed limiter for endpoints that do expensive or abusable work (bcrypt,
+OTP emails). Each limit is a sorted set of request timestamps per key; a Lua
+script drops entries older than the window, checks every key of the request
+(client IP and account) and records the request only if all of them are under
+their limit, so rejected requests do not extend the block.
+
+Limits are "<requests>/<seconds>" strings and can be overridden per scope with
+RATE_LIMIT_<SCOPE>_IP and RATE_LIMIT_<SCOPE>_USER. Like the cache helpers, the
+limiter fails open: if Redis is unavailable requests are let through.
+"""
+
+import math
+import os
+import secrets
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from redis_client import async_redis_client
+
+# Take the client IP from X-Forwarded-For; only enable behind a proxy that sets it
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() in ("1", "true", "yes")
+
+# KEYS: one sorted set per limit. ARGV: member, then (limit, window_ms) per key.
+# Returns {1, 0} when allowed, {0, retry_after_ms} when any key is over its limit.
+_SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i * 2])
+    local window = tonumber(ARGV[i * 2 + 1])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        retry_after = math.max(retry_after, tonumber(oldest[2]) + window - now)
+    end
+end
+if retry_after > 0 then
+    return {0, retry_after}
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[1])
+    redis.call('PEXPIRE', key, tonumber(ARGV[i * 2 + 1]))
+end
+return {1, 0}
+"""
+
+_sliding_window = async_redis_client.register_script(_SLIDING_WINDOW_SCRIPT)
+
+
+def parse_limit(value: str) -> Tuple[int, int]:
+    """'5/60' -> (5 requests, 60 seconds)."""
+    requests, _, seconds = value.partition("/")
+    return int(requests), int(seconds)
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def _request_identity(request: Request, field: str) -> Optional[str]:
+    """The account a request is about, read from its JSON or form body."""
+    try:
+        content_type = request.headers.get("content-type", "")
+        if content_type.startswith("application/json"):
+            data = await request.json()
+        elif content_type.startswith(("application/x-www-form-urlencoded", "multipart/form-data")):
+            data = await request.form()
+        else:
+            return None
+        value = data.get(field) if hasattr(data, "get") else None
+    except Exception:
+        # Malformed bodies are rejected by the route's own validation
+        return None
+    return str(value).strip().lower() if value else None
+
+
+async def check_rate_limit(limits) -> Optional[int]:
+    """
+    Record a request against `limits`, a list of (key, requests, seconds).
+
+    Returns None when allowed, else the seconds until a retry can succeed.
+    """
+    keys, args = [], [secrets.token_hex(8)]
+    for key, requests, seconds in limits:
+        keys.append(key)
+        args.extend([requests, seconds * 1000])
+    try:
+        allowed, retry_after_ms = await _sliding_window(keys=keys, args=args)
+    except Exception as e:
+        print(f"Rate limiter unavailable, allowing request: {e}")
+        return None
+    return None if allowed else max(1, math.ceil(int(retry_after_ms) / 1000))
+
+
+def rate_limit(scope: str, per_ip: str, per_user: str, identity_field: str = "user_id"):
+    """
+    Dependency limiting `scope` per client IP and per account.
+
+    The account is the `identity_field` of the request body (the email on the
+    auth endpoints). Raises 429 with Retry-After when either limit is exceeded.
+    """
+    ip_limit = parse_limit(os.getenv(f"RATE_LIMIT_{scope.upper()}_IP", per_ip))
+    user_limit = parse_limit(os.getenv(f"RATE_LIMIT_{scope.upper()}_USER", per_user))
+
+    async def dependency(request: Request):
+        limits = [(f"rate_limit:{scope}:ip:{client_ip(request)}", *ip_limit)]
+        identity = await _request_identity(request, identity_field)
+        if identity:
+            limits.append((f"rate_limit:{scope}:user:{identity}", *user_limit))
+
+        retry_after = await check_rate_limit(limits)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    return dependency
@@ -0,0 +1,123 @@
+"""
+Read Replica Routing
+
+get_read_db is a drop-in replacement for get_async_db on read-only routes. It
+hands out a session on the replica (REPLICA_DATABASE_URL) unless:
+
+- no replica is configured,
+- the user wrote something in the last READ_YOUR_WRITES_SECONDS (their own
+  changes may not have replicated yet; see services/data_version.py),
+- the replica's replay lag exceeds REPLICA_MAX_LAG_SECONDS, or the lag check
+  fails, or Redis cannot tell whether the user wrote recently.
+
+In all of those cases the request reads from the primary. Lag is measured on
+the replica at most every REPLICA_LAG_CHECK_INTERVAL seconds per process.
+
+Routes using it must not write, and must not call helpers that may write.
+"""
+
+import asyncio
+import os
+import time
+from collections import Counter
+
+from fastapi import Depends
+from sqlalchemy import text
+
+import database
+from auth.dependencies import get_current_user_id
+from redis_client import async_redis_client
+from services.data_version import READ_YOUR_WRITES_SECONDS, recent_write_key
+
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", 5))
+
+# Seconds of replay lag; 0 when the replica has replayed everything it received
+# (an idle primary would otherwise look like a growing lag)
+_LAG_QUERY = text("""
+    SELECT COALESCE(
+        CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+             ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END, 0)
+""")
+
+if database.REPLICA_ENABLED and READ_YOUR_WRITES_SECONDS < REPLICA_MAX_LAG_SECONDS + REPLICA_LAG_CHECK_INTERVAL:
+    # A lagging replica could still be accepted after the window closes
+    print(
+        "WARNING: READ_YOUR_WRITES_SECONDS should be at least "
+        "REPLICA_MAX_LAG_SECONDS + REPLICA_LAG_CHECK_INTERVAL for users to see their own writes"
+    )
+
+
+class _ReplicaHealth:
+    def __init__(self):
+        self.lag_seconds = None
+        self.healthy = False
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def is_usable(self) -> bool:
+        if time.monotonic() - self.checked_at < REPLICA_LAG_CHECK_INTERVAL:
+            return self.healthy
+        async with self._lock:
+            # Another request may have refreshed it while we waited
+            if time.monotonic() - self.checked_at >= REPLICA_LAG_CHECK_INTERVAL:
+                await self._check()
+        return self.healthy
+
+    async def _check(self):
+        try:
+            async with database.replica_async_engine.connect() as connection:
+                self.lag_seconds = float(await connection.scalar(_LAG_QUERY))
+            self.healthy = self.lag_seconds <= REPLICA_MAX_LAG_SECONDS
+            if not self.healthy:
+                print(f"Replica lag {self.lag_seconds:.1f}s over {REPLICA_MAX_LAG_SECONDS}s, reading from primary")
+        except Exception as e:
+            print(f"Replica lag check failed, reading from primary: {e}")
+            self.lag_seconds = None
+            self.healthy = False
+        self.checked_at = time.monotonic()
+
+
+_replica_health = _ReplicaHealth()
+routing_counts = Counter()
+
+
+async def _recently_wrote(user_id: int) -> bool:
+    try:
+        return bool(await async_redis_client.exists(recent_write_key(user_id)))
+    except Exception as e:
+        print(f"Recent write check failed for user {user_id}: {e}")
+        return True
+
+
+async def use_replica(user_id: int) -> bool:
+    if not database.REPLICA_ENABLED:
+        return False
+    if await _recently_wrote(user_id):
+        routing_counts["primary_recent_write"] += 1
+        return False
+    if not await _replica_health.is_usable():
+        routing_counts["primary_replica_lag"] += 1
+        return False
+    routing_counts["replica"] += 1
+    return True
+
+
+async def get_read_db(current_user_id: int = Depends(get_current_user_id)):
+    """Session for read-only routes: the replica when it is safe, otherwise the primary."""
+    if await use_replica(current_user_id):
+        session_factory = database.ReplicaAsyncSessionLocal
+    else:
+        session_factory = database.AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+def get_read_routing_metrics() -> dict:
+    return {
+        "enabled": database.REPLICA_ENABLED,
+        "replica_lag_seconds": _replica_health.lag_seconds,
+        "replica_healthy": _replica_health.healthy,
+        "routed": dict(routing_counts),
+    }
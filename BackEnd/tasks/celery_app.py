@@ -3,19 +3,24 @@
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import task_postrun, worker_init, worker_process_init
 from dotenv import load_dotenv
 
 # Load environment variables from .env file at the very beginning
 load_dotenv()
 
+# Imported after load_dotenv so the Redis settings see values from .env
+from redis_client import redis_url
+
 def create_celery():
     """
     Creates and configures a Celery application instance.
     This factory pattern is useful for organizing configuration.
     """
-    # Get the Redis URLs from environment variables
-    broker_url = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
-    result_backend = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
+    # Named databases on the shared Redis server, unless a deployment points
+    # Celery somewhere else explicitly
+    broker_url = os.getenv("CELERY_BROKER_URL") or redis_url("celery_broker")
+    result_backend = os.getenv("CELERY_RESULT_BACKEND") or redis_url("celery_results")
 
     # Create the Celery application instance
     # The first argument is the name of your project's main module.
@@ -24,7 +29,7 @@ def create_celery():
         'job_boost_project', # A more descriptive name for your project
         broker=broker_url,
         backend=result_backend,
-        include=['tasks.job_search']
+        include=['tasks.job_search', 'tasks.maintenance']
     )
 
     # Optional Celery configuration
@@ -49,9 +54,45 @@ def create_celery():
             # The schedule for execution. crontab(hour=3, minute=0) runs it at 3:00 AM UTC every day.
             'schedule': crontab(hour=3, minute=0),
         },
+
+        # Repair drift in the incrementally maintained user_match_stats counters
+        'reconcile-match-stats': {
+            'task': 'tasks.maintenance.reconcile_match_stats',
+            'schedule': crontab(hour=4, minute=30),
+        },
     }
     
     return celery_app
 
 # Create the celery instance to be imported by your FastAPI app and workers
 app = create_celery()
+
+
+@worker_init.connect
+def preload_heavy_modules(**kwargs):
+    # Workers need Gemini for every match. Importing it once in the parent before
+    # the pool forks shares it with all children instead of each paying on its first task.
+    from utils.gemini import get_genai
+    get_genai()
+
+
+@worker_process_init.connect
+def reset_db_pool_after_fork(**kwargs):
+    # Connections inherited from the parent process must not be shared with it;
+    # close=False drops them from this child's pool without closing the parent's sockets
+    from database import engine
+    engine.dispose(close=False)
+
+
+@task_postrun.connect
+def report_db_pool_usage(task=None, **kwargs):
+    # Only report when tasks had to wait for a connection, to keep logs quiet
+    from database import get_pool_metrics, sync_pool_stats
+    sync_metrics = get_pool_metrics()["sync"]
+    if sync_metrics.get("waits") or sync_metrics.get("timeouts"):
+        print(
+            f"DB pool after {task.name if task else 'task'}: in_use={sync_metrics.get('in_use')} "
+            f"overflow={sync_metrics.get('overflow')} waits={sync_metrics['waits']} "
+            f"timeouts={sync_metrics['timeouts']} max_wait={sync_metrics['wait_seconds_max']:.3f}s"
+        )
+        sync_pool_stats.reset()
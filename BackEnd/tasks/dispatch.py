@@ -0,0 +1,16 @@
+"""
+Task dispatch for the API.
+
+Routes enqueue Celery tasks by name, so the API process never imports the task
+modules (and with them the job search client, Gemini and the resume parsers).
+The Celery app itself is loaded on the first dispatch.
+"""
+
+FIND_AND_MATCH_JOBS_FOR_USER = "tasks.job_search.find_and_match_jobs_for_user"
+SCHEDULE_DAILY_JOB_SEARCHES = "tasks.job_search.schedule_daily_job_searches"
+
+
+def send_task(name: str, *args):
+    from tasks.celery_app import app
+
+    return app.send_task(name, args=args)
@@ -0,0 +1,46 @@
+import models
+from sqlalchemy import select, union
+from database import SessionLocal
+
+from tasks.celery_app import app
+from services.match_stats_service import match_stats_key, reconcile_user_match_stats
+from services.cache import cache_delete_sync
+
+RECONCILE_BATCH_SIZE = 200
+
+
+@app.task(bind=True, name='tasks.maintenance.reconcile_match_stats')
+def reconcile_match_stats(self):
+    """
+    Scheduled task that recomputes user_match_stats from job_matches.
+
+    The counters are maintained incrementally, so this only repairs drift from
+    writes that bypassed the session hooks (bulk statements, cascades) and lets
+    old hourly buckets age out for users without recent activity.
+    """
+    print("Reconciling user match stats...")
+    db = SessionLocal()
+    try:
+        user_ids = db.execute(union(
+            select(models.JobMatch.user_id).distinct(),
+            select(models.UserMatchStats.user_id),
+        )).scalars().all()
+
+        drifted = []
+        for start in range(0, len(user_ids), RECONCILE_BATCH_SIZE):
+            batch = user_ids[start:start + RECONCILE_BATCH_SIZE]
+            connection = db.connection()
+            drifted.extend(user_id for user_id in batch if reconcile_user_match_stats(connection, user_id))
+            # Commit per batch to keep row locks short
+            db.commit()
+
+        if drifted:
+            cache_delete_sync(*[match_stats_key(user_id) for user_id in drifted])
+        print(f"Reconciled match stats for {len(user_ids)} users, {len(drifted)} had drifted")
+        return {"status": "success", "users": len(user_ids), "drifted": len(drifted)}
+    except Exception as e:
+        db.rollback()
+        print(f"Error reconciling match stats: {e}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
@@ -0,0 +1,180 @@
+"""
+Database Connection Pooling
+
+Pool settings per process role and instrumented pool classes.
+
+Each process type sizes its pool differently: the API serves many short
+concurrent requests, Celery workers run a few long tasks per process and beat
+barely touches the database. DB_ROLE selects the defaults, and every setting
+can be overridden globally (DB_POOL_SIZE) or for one role (DB_WORKER_POOL_SIZE).
+
+With DB_PGBOUNCER=true the application does no pooling of its own (NullPool)
+and disables prepared statement caches, which PgBouncer's transaction pooling
+does not support.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+DB_ROLE = os.getenv("DB_ROLE", "api").lower()
+
+ROLE_DEFAULTS: Dict[str, Dict[str, object]] = {
+    "api": {"pool_size": 10, "max_overflow": 10, "pool_timeout": 10, "pool_recycle": 1800},
+    "worker": {"pool_size": 4, "max_overflow": 4, "pool_timeout": 30, "pool_recycle": 1800},
+    "beat": {"pool_size": 1, "max_overflow": 1, "pool_timeout": 30, "pool_recycle": 1800},
+    "script": {"pool_size": 2, "max_overflow": 2, "pool_timeout": 30, "pool_recycle": 1800},
+}
+
+
+def _is_true(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _setting(name: str, default: str) -> str:
+    """Role-specific env var first (DB_WORKER_POOL_SIZE), then global (DB_POOL_SIZE)."""
+    return os.getenv(f"DB_{DB_ROLE.upper()}_{name}") or os.getenv(f"DB_{name}") or str(default)
+
+
+PGBOUNCER_MODE = _is_true(_setting("PGBOUNCER", "false"))
+
+
+def get_pool_settings() -> Dict[str, object]:
+    """Resolved pool configuration for the current process role."""
+    defaults = ROLE_DEFAULTS.get(DB_ROLE, ROLE_DEFAULTS["api"])
+    return {
+        "role": DB_ROLE,
+        "pgbouncer": PGBOUNCER_MODE,
+        "pool_size": int(_setting("POOL_SIZE", defaults["pool_size"])),
+        "max_overflow": int(_setting("MAX_OVERFLOW", defaults["max_overflow"])),
+        "pool_timeout": float(_setting("POOL_TIMEOUT", defaults["pool_timeout"])),
+        "pool_recycle": int(_setting("POOL_RECYCLE", defaults["pool_recycle"])),
+        "pool_pre_ping": _is_true(_setting("POOL_PRE_PING", "true")),
+    }
+
+
+# --- Metrics ---
+
+# A checkout that waits longer than this counts as having waited for a connection
+WAIT_THRESHOLD_SECONDS = 0.005
+
+
+class PoolStats:
+    """
+    Checkout and connect counters shared by the instrumented pools. Thread safe.
+
+    Waits only cover time spent queueing for a free connection; opening a new
+    one (TCP + auth) is counted under connects.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.waits = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.connects = 0
+            self.connect_seconds_total = 0.0
+            self.connect_seconds_max = 0.0
+
+    def record(self, elapsed: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            if elapsed >= WAIT_THRESHOLD_SECONDS:
+                self.waits += 1
+                self.wait_seconds_total += elapsed
+                self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+
+    def record_connect(self, elapsed: float):
+        with self._lock:
+            self.connects += 1
+            self.connect_seconds_total += elapsed
+            self.connect_seconds_max = max(self.connect_seconds_max, elapsed)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "connects": self.connects,
+                "connect_seconds_total": round(self.connect_seconds_total, 6),
+                "connect_seconds_max": round(self.connect_seconds_max, 6),
+            }
+
+
+# Key in the connection record's info dict carrying the connect time to _do_get
+_CONNECT_SECONDS = "pool_stats_connect_seconds"
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times every checkout from the pool queue. When the checkout has to open a
+    new connection, that time is recorded as a connect and not as waiting.
+    """
+
+    stats: Optional[PoolStats] = None
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        record = super()._create_connection()
+        elapsed = time.perf_counter() - start
+        if self.stats is not None:
+            self.stats.record_connect(elapsed)
+            record.info[_CONNECT_SECONDS] = elapsed
+        return record
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except Exception:
+            if self.stats is not None:
+                self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.stats is not None:
+            connect_seconds = record.info.pop(_CONNECT_SECONDS, 0.0)
+            self.stats.record(max(0.0, time.perf_counter() - start - connect_seconds))
+        return record
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrumented_pool_class(pool_class, stats: PoolStats):
+    """Bind a stats object to an instrumented pool class for one engine."""
+    return type(pool_class.__name__, (pool_class,), {"stats": stats})
+
+
+def describe_pool(pool, stats: Optional[PoolStats]) -> Dict[str, object]:
+    """Current pool occupancy plus the checkout counters."""
+    metrics: Dict[str, object] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        metrics.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "in_use": pool.checkedout(),
+            # overflow() is negative while the base pool has not filled up yet
+            "overflow": max(pool.overflow(), 0),
+        })
+    if stats is not None:
+        metrics.update(stats.snapshot())
+    return metrics
@@ -0,0 +1,36 @@
+"""
+Lazy access to the Gemini SDK.
+
+google.generativeai pulls in grpc and protobuf and is by far the slowest import
+in the app. It is loaded and configured on first use instead of when the
+routers are imported, so API processes start serving without it. The API then
+imports it in a background thread (main.py lifespan), and callers build models
+inside their executor threads, so the import never runs on the event loop.
+"""
+
+import os
+import threading
+
+GEMINI_MODEL = "gemini-1.5-flash-latest"
+
+_genai = None
+_lock = threading.Lock()
+
+
+def get_genai():
+    """Import and configure google.generativeai once per process."""
+    global _genai
+    if _genai is None:
+        with _lock:
+            if _genai is None:
+                import google.generativeai as genai
+
+                api_key = os.getenv("GOOGLE_API_KEY")
+                if api_key:
+                    genai.configure(api_key=api_key)
+                _genai = genai
+    return _genai
+
+
+def generative_model(name: str = GEMINI_MODEL):
+    return get_genai().GenerativeModel(name)
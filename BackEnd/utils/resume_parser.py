@@ -1,26 +1,21 @@
 import re
 import json
 import os
-from io import BytesIO
 from typing import Dict, Optional
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
-import google.generativeai as genai
-from pdfminer.high_level import extract_text
-import docx2txt
-import fitz  # PyMuPDF
-from docx import Document
 from dotenv import load_dotenv
 
+from utils.gemini import generative_model
+from utils.text_extractors import extract_resume_text
+
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini API
+# Gemini is imported and configured on first use (utils.gemini)
 api_key = os.getenv("GOOGLE_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
-else:
+if not api_key:
     print("WARNING: GOOGLE_API_KEY not found. Resume parsing will use fallback method.")
 
 
@@ -62,40 +57,8 @@ def extract_phone(text: str) -> Optional[str]:
 
 def extract_text_from_upload(file_bytes: bytes, filename: str) -> str:
     """Return plain text from an uploaded resume."""
-    lower = filename.lower()
-    if lower.endswith(".pdf"):
-        return extract_text(BytesIO(file_bytes))
-    elif lower.endswith(".docx"):
-        # Using python-docx for better text extraction
-        try:
-            doc = Document(BytesIO(file_bytes))
-            text = []
-            for paragraph in doc.paragraphs:
-                text.append(paragraph.text)
-            return '\n'.join(text)
-        except:
-            # Fallback to docx2txt
-            return docx2txt.process(BytesIO(file_bytes))
-    elif lower.endswith(".doc"):
-        # Handle .doc files using docx2txt
-        return docx2txt.process(BytesIO(file_bytes))
-    else:
-        return file_bytes.decode("utf-8", errors="ignore")
-
-
-def extract_text_from_pdf_pymupdf(file_bytes: bytes) -> str:
-    """Alternative PDF text extraction using PyMuPDF for better accuracy (matches your working one.py)."""
-    try:
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        return text
-    except Exception as e:
-        print(f"PyMuPDF extraction failed: {e}")
-        # Fallback to pdfminer if PyMuPDF fails
-        return extract_text(BytesIO(file_bytes))
+    # Extractor order per file type comes from the benchmark-driven policy
+    return extract_resume_text(file_bytes, filename)
 
 
 async def parse_resume_with_gemini(resume_text: str) -> Dict:
@@ -110,9 +73,6 @@ async def parse_resume_with_gemini(resume_text: str) -> Dict:
     try:
         print("Starting Gemini API resume parsing...")
         
-        # Configure the Gemini model (same as your working one.py)
-        model = genai.GenerativeModel('gemini-1.5-flash-latest')
-        
         prompt = f"""
         You are an expert resume parser. Your task is to analyze the following resume text and extract the information into a structured JSON format.
         Please categorize the information under the following headings: 'personal_info', 'summary', 'experience', 'education', 'skills', 'projects', and 'courses_undertaken'.
@@ -174,28 +134,13 @@ async def parse_resume_with_gemini(resume_text: str) -> Dict:
         ---
         """
         
-        # Direct API call with timeout handling
-        def sync_generate():
-            try:
-                response = model.generate_content(prompt)
-                return response.text
-            except Exception as e:
-                print(f"Gemini API call failed: {e}")
-                raise
-        
-        # Run in thread pool with timeout to avoid blocking
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            try:
-                # 60 second timeout for API call
-                response_text = await asyncio.wait_for(
-                    loop.run_in_executor(executor, sync_generate),
-                    timeout=60.0
-                )
-                print("Gemini API parsing completed successfully")
-            except asyncio.TimeoutError:
-                print("Gemini API call timed out, using fallback parsing")
-                return fallback_resume_parsing(resume_text)
+        try:
+            # 60 second timeout for API call
+            response_text = await _generate_with_timeout(prompt, timeout=60.0)
+            print("Gemini API parsing completed successfully")
+        except asyncio.TimeoutError:
+            print("Gemini API call timed out, using fallback parsing")
+            return fallback_resume_parsing(resume_text)
         
         # Clean and parse the JSON response (same as your working one.py)
         cleaned_response = response_text.strip().replace('```json', '').replace('```', '').strip()
@@ -216,53 +161,69 @@ async def parse_resume_with_gemini(resume_text: str) -> Dict:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
 
+# Section header keywords used by the regex fallback parser. Order matters: when a
+# line mentions keywords of several sections, the first section listed wins.
+RESUME_SECTION_PATTERNS = {
+    "skills": ["skill", "technical skill", "core competenc", "technologies"],
+    "projects": ["project", "personal project", "academic project"],
+    "experiences_detail": ["experience", "work experience", "professional experience", "employment"],
+    "achievements": ["achievement", "accomplishment", "award", "honor", "recognition"],
+    "education": ["education", "academic", "degree", "university", "college"],
+    "courses": ["course", "certification", "training", "workshop"]
+}
+
+
+def _build_section_matcher(section_patterns: Dict[str, list]):
+    """
+    Compile every section keyword into a single alternation regex.
+
+    Returns the regex, the section names in priority order and a map from
+    keyword to section index. Longer keywords come first so the most specific
+    keyword wins when several start at the same position.
+    """
+    sections = list(section_patterns)
+    priority = {}
+    for index, section in enumerate(sections):
+        for keyword in section_patterns[section]:
+            priority.setdefault(keyword, index)
+    keywords = sorted(priority, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in keywords)), sections, priority
+
+
+_SECTION_KEYWORD_RE, _SECTION_NAMES, _SECTION_PRIORITY = _build_section_matcher(RESUME_SECTION_PATTERNS)
+_BULLET_ONLY_RE = re.compile(r'^\s*[-•▪▫◦‣⁃]\s*$')
+
+
+def _detect_section(line_lower: str) -> Optional[str]:
+    """Return the section a line is a header for, or None if it is content."""
+    keywords = _SECTION_KEYWORD_RE.findall(line_lower)
+    if not keywords:
+        return None
+    return _SECTION_NAMES[min(_SECTION_PRIORITY[k] for k in keywords)]
+
+
 def parse_resume_details(text: str) -> Dict[str, str]:
     """Fallback parser that extracts common resume sections using regex patterns."""
-    details = {
-        "skills": "",
-        "projects": "",
-        "experiences_detail": "",
-        "achievements": "",
-        "education": "",
-        "courses": ""
-    }
-    
-    # Convert text to lowercase for pattern matching
-    text_lower = text.lower()
-    lines = text.splitlines()
-    
+    # Collect lines per section and join once at the end
+    details = {section: [] for section in _SECTION_NAMES}
+
     current_section = None
-    section_patterns = {
-        "skills": ["skill", "technical skill", "core competenc", "technologies"],
-        "projects": ["project", "personal project", "academic project"],
-        "experiences_detail": ["experience", "work experience", "professional experience", "employment"],
-        "achievements": ["achievement", "accomplishment", "award", "honor", "recognition"],
-        "education": ["education", "academic", "degree", "university", "college"],
-        "courses": ["course", "certification", "training", "workshop"]
-    }
-    
-    for line in lines:
+    for line in text.splitlines():
         line_clean = line.strip()
-        line_lower = line_clean.lower()
-        
         if not line_clean:
             continue
-            
+
         # Check if this line is a section header
-        section_found = False
-        for section, patterns in section_patterns.items():
-            if any(pattern in line_lower for pattern in patterns):
-                current_section = section
-                section_found = True
-                break
-        
-        # If it's not a section header and we have a current section, add content
-        if not section_found and current_section and line_clean:
-            # Skip common resume formatting patterns
-            if not re.match(r'^\s*[-•▪▫◦‣⁃]\s*$', line_clean):
-                details[current_section] += line_clean + "\n"
-    
-    return {k: v.strip() for k, v in details.items()}
+        section = _detect_section(line_clean.lower())
+        if section is not None:
+            current_section = section
+            continue
+
+        # Skip common resume formatting patterns
+        if current_section and not _BULLET_ONLY_RE.match(line_clean):
+            details[current_section].append(line_clean)
+
+    return {k: "\n".join(v) for k, v in details.items()}
 
 
 async def process_resume_upload(file_bytes: bytes, filename: str, use_gemini: bool = True) -> Dict:
@@ -279,13 +240,7 @@ async def process_resume_upload(file_bytes: bytes, filename: str, use_gemini: bo
     """
     try:
         # Extract text from file
-        if filename.lower().endswith('.pdf'):
-            # Try PyMuPDF first, fallback to pdfminer
-            resume_text = extract_text_from_pdf_pymupdf(file_bytes)
-            if not resume_text.strip():
-                resume_text = extract_text_from_upload(file_bytes, filename)
-        else:
-            resume_text = extract_text_from_upload(file_bytes, filename)
+        resume_text = extract_text_from_upload(file_bytes, filename)
         
         if not resume_text.strip():
             return {"error": "Could not extract text from the uploaded file"}
@@ -404,24 +359,54 @@ def format_parsed_data_for_database(parsed_data: Dict) -> Dict[str, str]:
         }
 
 
-async def parse_resume_with_analysis(resume_text: str) -> Dict:
-    """Enhanced resume parser with validation and analysis."""
+# Threads for blocking Gemini calls. A call that times out keeps its thread until
+# the SDK returns, so the pool is sized for a few of those on top of live requests.
+GEMINI_WORKERS = int(os.getenv("GEMINI_WORKERS", 8))
+_gemini_executor = ThreadPoolExecutor(max_workers=GEMINI_WORKERS, thread_name_prefix="gemini")
+
+
+async def _generate_with_timeout(prompt: str, timeout: float) -> str:
+    """Run a Gemini generate_content call in a thread pool with a timeout."""
+
+    def sync_generate():
+        try:
+            # Built in the worker: the first call may still import the SDK
+            response = generative_model().generate_content(prompt)
+            return response.text
+        except Exception as e:
+            print(f"Gemini API call failed: {e}")
+            raise
+
+    # Shared executor: a per-call `with ThreadPoolExecutor()` would wait for the
+    # call to finish on exit, blocking the event loop after a timeout
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(
+        loop.run_in_executor(_gemini_executor, sync_generate),
+        timeout=timeout
+    )
+
+
+async def parse_resume_structured(resume_text: str) -> Dict:
+    """
+    Validate and parse a resume into structured data.
+
+    Only the structured 'parsed_data' is requested here; the longer analysis is
+    generated separately by generate_resume_analysis when the user asks for it.
+    """
     if not api_key:
         print("No API key found, using fallback parsing")
-        return {"parsed_data": fallback_resume_parsing(resume_text), "analysis": None}
+        return {"parsed_data": fallback_resume_parsing(resume_text)}
     
     if not resume_text.strip():
         return {"error": "Empty resume text provided"}
     
+    response_text = ""
     try:
-        print("Starting enhanced Gemini API resume parsing and validation...")
+        print("Starting Gemini API resume parsing and validation...")
         
-        # Configure the Gemini model
-        model = genai.GenerativeModel('gemini-1.5-flash-latest')
-        
-        # First check if the document is actually a resume
+        # The model first checks if the document is actually a resume
         prompt = f"""
-        You are an expert document analyzer, resume parser and career advisor. Please analyze the following text and determine if it's a legitimate resume/CV document.
+        You are an expert document analyzer and resume parser. Please analyze the following text and determine if it's a legitimate resume/CV document.
         
         Check for:
         1. Personal information (name, contact details)
@@ -432,14 +417,7 @@ async def parse_resume_with_analysis(resume_text: str) -> Dict:
         
         If this is NOT a resume or contains irrelevant content (like random text, advertisements, etc.), respond with a json exactly having parsed_data : "resume unfit"
         
-        If this IS a legitimate resume, 
-        
-        1. Parse the resume into structured JSON format
-        2. Provide detailed analysis and feedback
-        
-        Please extract information into structured JSON with two main sections: 'parsed_data' and 'analysis'.
-        
-        The 'parsed_data' should follow this schema:
+        If this IS a legitimate resume, parse it into structured JSON with a single 'parsed_data' section following this schema:
         {{
           "personal_info": {{
             "name": "string",
@@ -483,16 +461,7 @@ async def parse_resume_with_analysis(resume_text: str) -> Dict:
           "certifications": ["string"]
         }}
         
-        The 'analysis' should include:
-        {{
-          "good_points": ["List of strengths and positive aspects"],
-          "weak_points": ["List of areas that need improvement"],
-          "missing_things": ["List of important resume elements that are missing"],
-          "redundancy": ["List of redundant or unnecessary content"],
-          "improvements": ["List of specific suggestions for improvement"]
-        }}
-        
-        Return ONLY the JSON object with both 'parsed_data' and 'analysis' sections, no additional text.
+        Return ONLY the JSON object with the 'parsed_data' section, no additional text.
         
         Resume text to analyze:
         ---
@@ -500,26 +469,12 @@ async def parse_resume_with_analysis(resume_text: str) -> Dict:
         ---
         """
         
-        def sync_parse():
-            try:
-                response = model.generate_content(prompt)
-                return response.text
-            except Exception as e:
-                print(f"Gemini parsing call failed: {e}")
-                raise
-        
-        # Run parsing in thread pool with timeout
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            try:
-                response_text = await asyncio.wait_for(
-                    loop.run_in_executor(executor, sync_parse),
-                    timeout=90.0
-                )
-                print("Gemini API parsing completed successfully")
-            except asyncio.TimeoutError:
-                print("Gemini API call timed out, using fallback parsing")
-                return {"parsed_data": fallback_resume_parsing(resume_text), "analysis": None}
+        try:
+            response_text = await _generate_with_timeout(prompt, timeout=90.0)
+            print("Gemini API parsing completed successfully")
+        except asyncio.TimeoutError:
+            print("Gemini API call timed out, using fallback parsing")
+            return {"parsed_data": fallback_resume_parsing(resume_text)}
         
         # Clean and parse the JSON response
         cleaned_response = response_text.strip().replace('```json', '').replace('```', '').strip()
@@ -530,8 +485,8 @@ async def parse_resume_with_analysis(resume_text: str) -> Dict:
         if isinstance(parsed_result.get("parsed_data"), str) and "resume unfit" in parsed_result.get("parsed_data", "").lower():
             return {"error": "resume_unfit", "message": "Document is not a valid resume"}
         
-        print("Resume parsing and analysis JSON decoded successfully")
-        return parsed_result
+        print("Resume parsing JSON decoded successfully")
+        return {"parsed_data": parsed_result.get("parsed_data", {})}
         
     except json.JSONDecodeError as e:
         print(f"JSON decode error: {e}")
@@ -545,6 +500,66 @@ async def parse_resume_with_analysis(resume_text: str) -> Dict:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
 
+async def generate_resume_analysis(resume_text: str) -> Dict:
+    """Generate career feedback (good/weak points, improvements) for a resume."""
+    if not api_key:
+        return {"error": "Resume analysis requires Google API key"}
+    
+    if not resume_text or not resume_text.strip():
+        return {"error": "Empty resume text provided"}
+    
+    response_text = ""
+    try:
+        print("Starting Gemini API resume analysis...")
+        
+        prompt = f"""
+        You are an expert career advisor. Please review the following resume and provide detailed analysis and feedback.
+        
+        Return ONLY a JSON object with this structure, no additional text:
+        {{
+          "good_points": ["List of strengths and positive aspects"],
+          "weak_points": ["List of areas that need improvement"],
+          "missing_things": ["List of important resume elements that are missing"],
+          "redundancy": ["List of redundant or unnecessary content"],
+          "improvements": ["List of specific suggestions for improvement"]
+        }}
+        
+        Resume text to analyze:
+        ---
+        {resume_text}
+        ---
+        """
+        
+        try:
+            response_text = await _generate_with_timeout(prompt, timeout=90.0)
+            print("Gemini API analysis completed successfully")
+        except asyncio.TimeoutError:
+            print("Gemini API analysis call timed out")
+            return {"error": "Resume analysis timed out"}
+        
+        cleaned_response = response_text.strip().replace('```json', '').replace('```', '').strip()
+        analysis = json.loads(cleaned_response)
+        
+        # Accept both a bare analysis object and one wrapped in an 'analysis' key
+        if isinstance(analysis, dict) and isinstance(analysis.get("analysis"), dict):
+            analysis = analysis["analysis"]
+        if not isinstance(analysis, dict):
+            return {"error": "Unexpected analysis format from the API response."}
+        
+        return analysis
+        
+    except json.JSONDecodeError as e:
+        print(f"JSON decode error: {e}")
+        return {
+            "error": "Failed to decode JSON from the API response.",
+            "details": str(e),
+            "raw_response": response_text[:500] + "..." if len(response_text) > 500 else response_text
+        }
+    except Exception as e:
+        print(f"Resume analysis error: {e}")
+        return {"error": f"An unexpected error occurred: {str(e)}"}
+
+
 def validate_file_constraints(file_content: bytes, filename: str) -> Dict[str, str]:
     """Validate file size and type constraints."""
     errors = []
@@ -0,0 +1,155 @@
+"""
+Resume Text Extraction
+
+Registry of the text extractors available for each resume file type, plus the
+runtime policy that decides which one to try first. The policy is produced by
+benchmarks/bench_extractors.py: extractors that meet the quality threshold on
+our sample resumes are ordered fastest first, so the common case pays for a
+single extraction and slower extractors only run when the first result is poor.
+"""
+
+import json
+import os
+from io import BytesIO
+from typing import Callable, Dict, List, Optional
+
+
+# --- Extractors ---
+# Each extractor imports its library lazily so a missing optional package only
+# disables that extractor instead of breaking the whole module.
+
+def extract_pdf_pymupdf(file_bytes: bytes) -> str:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(stream=file_bytes, filetype="pdf")
+    try:
+        return "".join(page.get_text() for page in doc)
+    finally:
+        doc.close()
+
+
+def extract_pdf_pdfminer(file_bytes: bytes) -> str:
+    from pdfminer.high_level import extract_text
+
+    return extract_text(BytesIO(file_bytes))
+
+
+def extract_docx_python_docx(file_bytes: bytes) -> str:
+    from docx import Document
+
+    doc = Document(BytesIO(file_bytes))
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs)
+
+
+def extract_docx_docx2txt(file_bytes: bytes) -> str:
+    import docx2txt
+
+    return docx2txt.process(BytesIO(file_bytes))
+
+
+EXTRACTORS: Dict[str, Dict[str, Callable[[bytes], str]]] = {
+    ".pdf": {
+        "pymupdf": extract_pdf_pymupdf,
+        "pdfminer": extract_pdf_pdfminer,
+    },
+    ".docx": {
+        "python-docx": extract_docx_python_docx,
+        "docx2txt": extract_docx_docx2txt,
+    },
+    ".doc": {
+        "docx2txt": extract_docx_docx2txt,
+    },
+}
+
+# Used until a benchmark has written a policy file
+DEFAULT_EXTRACTOR_ORDER: Dict[str, List[str]] = {
+    ".pdf": ["pymupdf", "pdfminer"],
+    ".docx": ["python-docx", "docx2txt"],
+    ".doc": ["docx2txt"],
+}
+
+
+# --- Quality threshold ---
+
+MIN_TEXT_CHARS = int(os.getenv("RESUME_MIN_TEXT_CHARS", 200))
+MIN_ALNUM_RATIO = float(os.getenv("RESUME_MIN_ALNUM_RATIO", 0.6))
+
+
+def text_yield(text: Optional[str]) -> Dict[str, float]:
+    """Basic yield metrics for extracted text."""
+    text = text or ""
+    visible = [c for c in text if not c.isspace()]
+    alnum = sum(1 for c in visible if c.isalnum())
+    return {
+        "chars": len(visible),
+        "words": len(text.split()),
+        "alnum_ratio": alnum / len(visible) if visible else 0.0,
+    }
+
+
+def meets_quality_threshold(text: Optional[str]) -> bool:
+    """True if the text looks like a real extraction rather than empty or garbled output."""
+    metrics = text_yield(text)
+    return metrics["chars"] >= MIN_TEXT_CHARS and metrics["alnum_ratio"] >= MIN_ALNUM_RATIO
+
+
+# --- Policy ---
+
+EXTRACTOR_POLICY_PATH = os.getenv(
+    "RESUME_EXTRACTOR_POLICY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "extractor_policy.json"),
+)
+
+_policy_cache: Optional[Dict[str, List[str]]] = None
+
+
+def load_extractor_policy(path: str = EXTRACTOR_POLICY_PATH) -> Dict[str, List[str]]:
+    """Return the extractor order per file type, falling back to the defaults."""
+    order = {ext: list(names) for ext, names in DEFAULT_EXTRACTOR_ORDER.items()}
+    if os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                policy = json.load(f)
+            for ext, names in policy.get("order", {}).items():
+                known = [name for name in names if name in EXTRACTORS.get(ext, {})]
+                if known:
+                    # Keep any extractor the policy did not mention as a last resort
+                    order[ext] = known + [name for name in order.get(ext, []) if name not in known]
+        except (OSError, ValueError) as e:
+            print(f"Failed to load extractor policy from {path}: {e}. Using defaults.")
+    return order
+
+
+def get_extractor_order(extension: str) -> List[str]:
+    global _policy_cache
+    if _policy_cache is None:
+        _policy_cache = load_extractor_policy()
+    return _policy_cache.get(extension, [])
+
+
+def extract_resume_text(file_bytes: bytes, filename: str) -> str:
+    """
+    Extract text from a resume using the configured extractor order.
+
+    The first extractor whose output meets the quality threshold wins. If none
+    do, the result with the highest text yield is returned.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    order = get_extractor_order(extension)
+    if not order:
+        return file_bytes.decode("utf-8", errors="ignore")
+
+    best_text = ""
+    for name in order:
+        try:
+            text = EXTRACTORS[extension][name](file_bytes) or ""
+        except Exception as e:
+            print(f"{name} extraction failed for {filename}: {e}")
+            continue
+
+        if meets_quality_threshold(text):
+            return text
+        if text_yield(text)["chars"] > text_yield(best_text)["chars"]:
+            best_text = text
+
+    return best_text
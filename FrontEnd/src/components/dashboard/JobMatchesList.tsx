@@ -239,15 +239,15 @@ const JobMatchesList: React.FC = () => {
                   </div>
                 </div>
                 
-                {match.job.job_description && (
+                {match.job.job_description_preview && (
                   <div className="mb-3">
                     <p className="text-sm text-gray-600 dark:text-gray-300 overflow-hidden" style={{
                       display: '-webkit-box',
                       WebkitLineClamp: 2,
                       WebkitBoxOrient: 'vertical'
                     }}>
-                      {match.job.job_description.substring(0, 150)}
-                      {match.job.job_description.length > 150 && '...'}
+                      {match.job.job_description_preview.substring(0, 150)}
+                      {match.job.job_description_preview.length > 150 && '...'}
                     </p>
                   </div>
                 )}
@@ -7,7 +7,8 @@ export interface Job {
   job_id: string;
   employer_name?: string;
   job_title?: string;
-  job_description?: string;
+  job_description?: string;  // Only in the match detail response
+  job_description_preview?: string;  // First characters of the description, in list responses
   job_apply_link?: string;
   job_city?: string;
   job_country?: string;
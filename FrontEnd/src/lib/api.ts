@@ -91,6 +91,10 @@ export const fetchProfile = () => api.get("/profile/");
 
 export const fetchCompleteProfile = () => api.get("/profile/complete");
 
+// Resume analysis is generated on first request, so allow for the AI call
+export const fetchResumeAnalysis = () =>
+  api.get("/profile/resume-analysis", { timeout: 120000 });
+
 export const updateProfile = (data: Record<string, unknown>) =>
   api.put("/profile/", data);
 
@@ -115,9 +119,25 @@ export const resetPassword = (email: string, otp: string, password: string) =>
   api.post("/user/reset-password", { user_id: email, otp, password });
 
 // Job Matches API
-export const fetchJobMatches = (params?: { limit?: number; offset?: number; min_relevance?: number }) =>
+// Paginated listings return the next page's cursor in the X-Next-Cursor header
+// Filters are applied server side; /jobs/matches/facets returns the counts per filter value
+export type JobMatchFilters = {
+  min_relevance?: number;
+  status?: string;
+  remote?: boolean;
+  employment_type?: string;
+  city?: string;
+  country?: string;
+  min_salary?: number;
+  max_salary?: number;
+};
+
+export const fetchJobMatches = (params?: { limit?: number; offset?: number; cursor?: string } & JobMatchFilters) =>
   api.get("/jobs/matches", { params });
 
+export const fetchJobMatchFacets = (params?: JobMatchFilters) =>
+  api.get("/jobs/matches/facets", { params });
+
 export const fetchJobMatchStats = () => api.get("/jobs/matches/stats");
 
 // Dashboard API
@@ -131,9 +151,25 @@ export const updateJobMatchStatus = (matchId: number, status: string) =>
 export const deleteJobMatch = (matchId: number) =>
   api.delete(`/jobs/matches/${matchId}`);
 
-export const fetchApplications = (params?: { limit?: number; offset?: number }) =>
+// Batch versions: one request for many matches, with a per-id outcome in the response
+export const bulkUpdateJobMatchStatus = (matchIds: number[], status: string) =>
+  api.post("/jobs/matches/bulk-status", { match_ids: matchIds, status });
+
+export const bulkDeleteJobMatches = (matchIds: number[]) =>
+  api.post("/jobs/matches/bulk-delete", { match_ids: matchIds });
+
+export const fetchApplications = (params?: { limit?: number; offset?: number; cursor?: string }) =>
   api.get("/jobs/applications", { params });
 
+export const searchJobs = (params: {
+  q: string;
+  remote?: boolean;
+  employment_type?: string;
+  country?: string;
+  limit?: number;
+  cursor?: string;
+}) => api.get("/jobs/search", { params });
+
 // Contact API
 export const submitContactForm = (contactData: {
   name: string;
@@ -1,7 +1,7 @@
 
 import React from 'react';
 import { useQuery, useQueryClient } from "@tanstack/react-query";
-import { fetchProfile, fetchCompleteProfile, fetchDashboardData } from "@/lib/api";
+import { fetchProfile, fetchCompleteProfile, fetchDashboardData, fetchResumeAnalysis } from "@/lib/api";
 import { Link, useNavigate, useLocation } from 'react-router-dom';
 import { toast } from "sonner";
 import { Button } from "@/components/ui/button";
@@ -96,6 +96,17 @@ const Dashboard = () => {
   
   const profile = profileResponse?.data;
 
+  // Resume analysis is generated lazily, only fetch it when the remarks tab is opened
+  const { data: analysisResponse, isLoading: analysisLoading } = useQuery({
+    queryKey: ["resumeAnalysis", profile?.last_updated],
+    queryFn: fetchResumeAnalysis,
+    enabled: !!token && portfolioTab === "remarks" && !!profile?.has_resume && !profile?.resume_remarks,
+    staleTime: Infinity,
+    retry: 1,
+  });
+
+  const resumeRemarks = profile?.resume_remarks ?? analysisResponse?.data?.resume_remarks;
+
   // Handle dashboard data changes
   React.useEffect(() => {
     if (!dashboardData) return;
@@ -574,10 +585,10 @@ const Dashboard = () => {
   // Remarks Section Component
   const RemarksSection = () => (
     <div className="space-y-6">
-      {profile?.resume_remarks ? (
+      {resumeRemarks ? (
         <>
           {/* Good Points */}
-          {profile.resume_remarks.good_points?.length > 0 && (
+          {resumeRemarks.good_points?.length > 0 && (
             <Card className="border-0 shadow-sm">
               <CardHeader className="pb-4">
                 <CardTitle className="flex items-center text-lg font-semibold text-green-700">
@@ -587,7 +598,7 @@ const Dashboard = () => {
               </CardHeader>
               <CardContent>
                 <ul className="space-y-2">
-                  {profile.resume_remarks.good_points.map((point: string, index: number) => (
+                  {resumeRemarks.good_points.map((point: string, index: number) => (
                     <li key={index} className="flex items-start">
                       <CheckCircle className="h-4 w-4 text-green-500 mt-0.5 mr-2 flex-shrink-0" />
                       <span className="text-gray-700">{point}</span>
@@ -599,7 +610,7 @@ const Dashboard = () => {
           )}
 
           {/* Weak Points */}
-          {profile.resume_remarks.weak_points?.length > 0 && (
+          {resumeRemarks.weak_points?.length > 0 && (
             <Card className="border-0 shadow-sm">
               <CardHeader className="pb-4">
                 <CardTitle className="flex items-center text-lg font-semibold text-orange-700">
@@ -609,7 +620,7 @@ const Dashboard = () => {
               </CardHeader>
               <CardContent>
                 <ul className="space-y-2">
-                  {profile.resume_remarks.weak_points.map((point: string, index: number) => (
+                  {resumeRemarks.weak_points.map((point: string, index: number) => (
                     <li key={index} className="flex items-start">
                       <AlertCircle className="h-4 w-4 text-orange-500 mt-0.5 mr-2 flex-shrink-0" />
                       <span className="text-gray-700">{point}</span>
@@ -621,7 +632,7 @@ const Dashboard = () => {
           )}
 
           {/* Missing Things */}
-          {profile.resume_remarks.missing_things?.length > 0 && (
+          {resumeRemarks.missing_things?.length > 0 && (
             <Card className="border-0 shadow-sm">
               <CardHeader className="pb-4">
                 <CardTitle className="flex items-center text-lg font-semibold text-red-700">
@@ -631,7 +642,7 @@ const Dashboard = () => {
               </CardHeader>
               <CardContent>
                 <ul className="space-y-2">
-                  {profile.resume_remarks.missing_things.map((point: string, index: number) => (
+                  {resumeRemarks.missing_things.map((point: string, index: number) => (
                     <li key={index} className="flex items-start">
                       <XCircle className="h-4 w-4 text-red-500 mt-0.5 mr-2 flex-shrink-0" />
                       <span className="text-gray-700">{point}</span>
@@ -643,7 +654,7 @@ const Dashboard = () => {
           )}
 
           {/* Improvements */}
-          {profile.resume_remarks.improvements?.length > 0 && (
+          {resumeRemarks.improvements?.length > 0 && (
             <Card className="border-0 shadow-sm">
               <CardHeader className="pb-4">
                 <CardTitle className="flex items-center text-lg font-semibold text-blue-700">
@@ -653,7 +664,7 @@ const Dashboard = () => {
               </CardHeader>
               <CardContent>
                 <ul className="space-y-2">
-                  {profile.resume_remarks.improvements.map((point: string, index: number) => (
+                  {resumeRemarks.improvements.map((point: string, index: number) => (
                     <li key={index} className="flex items-start">
                       <TrendingUp className="h-4 w-4 text-blue-500 mt-0.5 mr-2 flex-shrink-0" />
                       <span className="text-gray-700">{point}</span>
@@ -665,7 +676,7 @@ const Dashboard = () => {
           )}
 
           {/* Redundancy */}
-          {profile.resume_remarks.redundancy?.length > 0 && (
+          {resumeRemarks.redundancy?.length > 0 && (
             <Card className="border-0 shadow-sm">
               <CardHeader className="pb-4">
                 <CardTitle className="flex items-center text-lg font-semibold text-gray-700">
@@ -675,7 +686,7 @@ const Dashboard = () => {
               </CardHeader>
               <CardContent>
                 <ul className="space-y-2">
-                  {profile.resume_remarks.redundancy.map((point: string, index: number) => (
+                  {resumeRemarks.redundancy.map((point: string, index: number) => (
                     <li key={index} className="flex items-start">
                       <AlertCircle className="h-4 w-4 text-gray-500 mt-0.5 mr-2 flex-shrink-0" />
                       <span className="text-gray-700">{point}</span>
@@ -686,6 +697,14 @@ const Dashboard = () => {
             </Card>
           )}
         </>
+      ) : analysisLoading ? (
+        <Card className="border-0 shadow-sm">
+          <CardContent className="text-center py-12">
+            <RefreshCw className="mx-auto h-12 w-12 text-gray-400 mb-4 animate-spin" />
+            <h3 className="text-lg font-medium text-gray-900 mb-2">Analyzing Your Resume</h3>
+            <p className="text-gray-500">This can take a few seconds the first time.</p>
+          </CardContent>
+        </Card>
       ) : (
         <Card className="border-0 shadow-sm">
           <CardContent className="text-center py-12">